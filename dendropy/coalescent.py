@@ -177,6 +177,31 @@ def coalesce(nodes,
     if rng is None:
         rng = GLOBAL_RNG
 
+    return _coalesce_bound(nodes,
+            pop_size,
+            period,
+            rng.expovariate,
+            rng.sample,
+            use_expected_tmrca)
+
+def _coalesce_bound(nodes,
+                    pop_size,
+                    period,
+                    expo_fn,
+                    sample_fn,
+                    use_expected_tmrca=False):
+    """
+    Does the work of `coalesce()`, drawing waiting times with `expo_fn` and
+    picking the nodes to coalesce with `sample_fn`, which should be the
+    `expovariate` and `sample` methods of a random number generator. Callers
+    that coalesce many sets of nodes can bind these once, rather than looking
+    them up on the generator for every coalescent event.
+    """
+
+    # idiot-check, because I can be an idiot
+    if not nodes:
+        return []
+
     # define the function needed to create new coalescence nodes
     new_node = nodes[0].__class__
 
@@ -199,8 +224,8 @@ def coalesce(nodes,
         else:
             # draw a time to coalesce: this will be an exponential random
             # variable with parameter (rate) of BINOMIAL[n_genes 2]
-            # multiplied pop_size
-            tmrca = time_to_coalescence(len(nodes), pop_size=pop_size, rng=rng)
+            # multiplied pop_size (as given by `time_to_coalescence()`)
+            tmrca = expo_fn(probability.binomial_coefficient(len(nodes), 2)) * pop_size
 
         # if no time_remaining is given (i.e, we want to coalesce till
         # there is only one gene left) or, if we are working under the
@@ -215,7 +240,7 @@ def coalesce(nodes,
                 node.edge.length = node.edge.length + tmrca
 
             # pick two nodes to coalesce at random
-            to_coalesce = rng.sample(nodes, 2)
+            to_coalesce = sample_fn(nodes, 2)
 
             # create the new ancestor of these nodes
             new_ancestor = new_node()
@@ -22,13 +22,14 @@ Maps data formats to their specific parsers/writers.
 
 from dendropy.utility import error
 from dendropy.utility import iosys
-from dendropy.utility.containers import OrderedCaselessDict
 
 ###############################################################################
 ## DataSchema
 
 class DataSchema(object):
 
+    __slots__ = ['name', 'reader_type', 'writer_type', 'tree_source_iter']
+
     def __init__(self,
                  name,
                  reader_type=None,
@@ -69,39 +70,91 @@ class DataSchema(object):
 class DataSchemaRegistry(object):
 
     def __init__(self):
-        self.formats = OrderedCaselessDict()
+        # keyed by lower-cased schema name; the original casing is
+        # preserved in `DataSchema.name`
+        self.formats = {}
+        # direct maps from lower-cased schema name to the reader/writer
+        # types and tree iterators; only supported operations are entered,
+        # anything else falls through to the `DataSchema` for reporting.
+        # lookups try the name as given first, so that callers passing the
+        # canonical (lower-case) name, as almost all do, need not pay for
+        # lower-casing it
+        self._readers = {}
+        self._writers = {}
+        self._tree_source_iters = {}
+
+    def _index_format(self, key, data_format):
+        self._unindex_format(key)
+        self.formats[key] = data_format
+        if data_format.reader_type is not None:
+            self._readers[key] = data_format.reader_type
+        if data_format.writer_type is not None:
+            self._writers[key] = data_format.writer_type
+        if data_format.tree_source_iter is not None:
+            self._tree_source_iters[key] = data_format.tree_source_iter
+
+    def _unindex_format(self, key):
+        self._readers.pop(key, None)
+        self._writers.pop(key, None)
+        self._tree_source_iters.pop(key, None)
 
     def add_format(self, data_format):
-        self.formats[data_format.name] = data_format
+        self._index_format(data_format.name.lower(), data_format)
 
     def remove_format(self, data_format):
-        del(self.formats[data_format.name])
+        key = data_format.name.lower()
+        del(self.formats[key])
+        self._unindex_format(key)
 
     def add(self, name, reader_type=None, writer_type=None, tree_source_iter=None):
-        self.formats[name] = DataSchema(name,
+        self._index_format(name.lower(), DataSchema(name,
                 reader_type=reader_type,
                 writer_type=writer_type,
-                tree_source_iter=tree_source_iter)
+                tree_source_iter=tree_source_iter))
 
     def remove(self, name):
-        del(self.formats[name])
+        key = name.lower()
+        del(self.formats[key])
+        self._unindex_format(key)
+
+    def _resolve(self, name):
+        """
+        Returns the `DataSchema` registered under `name` (case-insensitive).
+        """
+        try:
+            return self.formats[name.lower()]
+        except KeyError:
+            raise error.UnsupportedSchemaError("'%s' is not a recognized data schema name" % name)
 
     def get_reader(self, name, **kwargs):
         ## hack to avoid confusing users ##
 #        if name.lower() == "fasta":
 #            raise error.UnsupportedSchemaError("FASTA data needs to be specified as 'dnafasta', 'rnafasta', or 'proteinfasta'")
-        if name not in self.formats:
-            raise error.UnsupportedSchemaError("'%s' is not a recognized data schema name" % name)
-        return self.formats[name].get_reader(**kwargs)
+        try:
+            reader_type = self._readers[name]
+        except KeyError:
+            try:
+                reader_type = self._readers[name.lower()]
+            except KeyError:
+                return self._resolve(name).get_reader(**kwargs)
+        return reader_type(**kwargs)
 
     def get_writer(self, name, **kwargs):
-        if name not in self.formats:
-            raise error.UnsupportedSchemaError("'%s' is not a recognized data schema name" % name)
-        return self.formats[name].get_writer(**kwargs)
+        try:
+            writer_type = self._writers[name]
+        except KeyError:
+            try:
+                writer_type = self._writers[name.lower()]
+            except KeyError:
+                return self._resolve(name).get_writer(**kwargs)
+        return writer_type(**kwargs)
 
     def tree_source_iter(self, stream, name, **kwargs):
-        if name not in self.formats:
-            raise error.UnsupportedSchemaError("'%s' is not a recognized data schema name" % name)
-        return self.formats[name].get_tree_source_iter(stream, **kwargs)
-
-
+        try:
+            tree_source_iter = self._tree_source_iters[name]
+        except KeyError:
+            try:
+                tree_source_iter = self._tree_source_iters[name.lower()]
+            except KeyError:
+                return self._resolve(name).get_tree_source_iter(stream, **kwargs)
+        return tree_source_iter(stream, **kwargs)
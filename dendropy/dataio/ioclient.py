@@ -24,8 +24,15 @@ from dendropy.dataio.dataschema import DataSchemaRegistry
 
 _GLOBAL_DATA_SCHEMA_REGISTRY = DataSchemaRegistry()
 
+## bound once here so that the convenience functions below do not
+## re-resolve the registry method on every call
+_registry_add = _GLOBAL_DATA_SCHEMA_REGISTRY.add
+_registry_get_reader = _GLOBAL_DATA_SCHEMA_REGISTRY.get_reader
+_registry_get_writer = _GLOBAL_DATA_SCHEMA_REGISTRY.get_writer
+_registry_tree_source_iter = _GLOBAL_DATA_SCHEMA_REGISTRY.tree_source_iter
+
 def register(schema, reader, writer, tree_source_iter):
-    _GLOBAL_DATA_SCHEMA_REGISTRY.add(schema, reader, writer, tree_source_iter)
+    _registry_add(schema, reader, writer, tree_source_iter)
 
 def get_reader(schema, **kwargs):
     """
@@ -54,7 +61,7 @@ def get_reader(schema, **kwargs):
     Other keywords may be implemented by specific readers (e.g. NexusReader,
     NewickReader). Refer to their documentation for details.
     """
-    return _GLOBAL_DATA_SCHEMA_REGISTRY.get_reader(schema, **kwargs)
+    return _registry_get_reader(schema, **kwargs)
 
 def get_writer(schema, **kwargs):
     """
@@ -74,7 +81,7 @@ def get_writer(schema, **kwargs):
         - `exclude_chars`: Characters in the `DataSet` or `TaxonDomain` will
                 not written.
     """
-    return _GLOBAL_DATA_SCHEMA_REGISTRY.get_writer(schema, **kwargs)
+    return _registry_get_writer(schema, **kwargs)
 
 def tree_source_iter(stream, schema, **kwargs):
     """
@@ -118,7 +125,7 @@ def tree_source_iter(stream, schema, **kwargs):
         log_frequency = 1
     if log_frequency <= 0:
         write_progress = None
-    tree_iter = _GLOBAL_DATA_SCHEMA_REGISTRY.tree_source_iter(stream, schema, **kwargs)
+    tree_iter = _registry_tree_source_iter(stream, schema, **kwargs)
     count = 0
     for count, t in enumerate(tree_iter):
         if count >= tree_offset and t is not None:
@@ -528,10 +528,29 @@ class NewickWriter(iosys.DataWriter):
         """
         Given a DendroPy Node, this returns the Node as a NEWICK
         statement according to the class-defined formatting rules.
+        The subtree is walked in postorder using an explicit stack, so
+        that arbitrarily deep trees can be written.
         """
-        child_nodes = node.child_nodes()
-        if child_nodes:
-            subnodes = [self.compose_node(child) for child in child_nodes]
+        composed = {}
+        to_visit = [(node, False)]
+        while to_visit:
+            nd, children_composed = to_visit.pop()
+            child_nodes = nd.child_nodes()
+            if children_composed or not child_nodes:
+                subnodes = [composed.pop(id(child)) for child in child_nodes]
+                composed[id(nd)] = self._compose_node_statement(nd, subnodes)
+            else:
+                to_visit.append((nd, True))
+                for child in reversed(child_nodes):
+                    to_visit.append((child, False))
+        return composed[id(node)]
+
+    def _compose_node_statement(self, node, subnodes):
+        """
+        Returns the NEWICK statement for `node`, given the (already
+        composed) statements of its children, `subnodes`.
+        """
+        if subnodes:
             statement = '(' + ','.join(subnodes) + ')'
             if not (self.suppress_internal_taxon_labels and self.suppress_internal_node_labels):
                 statement = statement + self.choose_display_tag(node)
@@ -28,6 +28,11 @@ from dendropy.utility import textutils
 from dendropy.utility import iosys
 from dendropy.dataio import nexustokenizer
 
+## groups of (polymorphic or ambiguous) states in a multistate sequence,
+## e.g., "(AG)" or "{CT}"
+MULTISTATE_CHAR_GROUP_PATTERN = re.compile(r'[\(|\{].+?[\)\}]')
+MULTISTATE_CHAR_GROUP_CAPTURE_PATTERN = re.compile(r'([\(|\{].+?[\)\}])')
+
 ###############################################################################
 ## NexusReader
 
@@ -202,6 +207,7 @@ class NexusReader(iosys.DataReader):
         self.taxa_blocks = {}
         self.file_specified_ntax = None
         self.file_specified_nchar = None
+        self._symbol_state_lookup = {}
 
     def data_format_error(self, message):
         """
@@ -627,6 +633,7 @@ class NexusReader(iosys.DataReader):
             self._build_state_alphabet(char_block, self.symbols)
         taxon_set = char_block.taxon_set
         symbol_state_map = char_block.default_state_alphabet.symbol_state_map()
+        self._symbol_state_lookup = self._build_symbol_state_lookup(symbol_state_map)
         token = self.stream_tokenizer.read_next_token()
         # character_type = dataobject.CharacterType(state_alphabet=char_block.default_state_alphabet)
         # char_block.character_types.append(character_type)
@@ -668,11 +675,39 @@ class NexusReader(iosys.DataReader):
         #     for ci, cell in enumerate(vec):
         #         cell.character_type = character_type
 
+    def _build_symbol_state_lookup(self, symbol_state_map):
+        """
+        Returns a dictionary mapping each of the 256 single-byte characters
+        to the state it denotes in `symbol_state_map` (comparing on the
+        upper-cased character, as is done when processing characters one at
+        a time), skipping characters that do not denote a state.
+        """
+        lookup = {}
+        for i in xrange(256):
+            c = chr(i)
+            state = symbol_state_map.get(c.upper())
+            if state is not None:
+                lookup[c] = state
+        return lookup
+
     def _process_chars(self, char_group, char_block, symbol_state_map, taxon):
         if self.exclude_chars:
             return
         if not char_group:
             return
+        if '{' not in char_group and '(' not in char_group:
+            # fast path: no multistate mark-up, so every character maps
+            # directly to a state; anything not in the lookup (e.g., match
+            # characters or errors) is handled character-by-character below
+            lookup = self._symbol_state_lookup
+            try:
+                states = [lookup[char] for char in char_group]
+            except KeyError:
+                pass
+            else:
+                cell_type = dataobject.CharacterDataCell
+                char_block[taxon].extend([cell_type(value=state) for state in states])
+                return
         char_group = self._parse_nexus_multistate(char_group)
         for char in char_group:
             if len(char) == 1:
@@ -710,11 +745,8 @@ class NexusReader(iosys.DataReader):
         `open_tag` and `close_tag` with their values set to the opening and closing
         tokens.
         """
-        spat = re.compile('[\(|\{].+?[\)\}]')
-        mpat = re.compile('([\(|\{].+?[\)\}])')
-
-        unambig = spat.split(seq)
-        ambig = mpat.findall(seq)
+        unambig = MULTISTATE_CHAR_GROUP_PATTERN.split(seq)
+        ambig = MULTISTATE_CHAR_GROUP_CAPTURE_PATTERN.findall(seq)
         result = []
         for i in xrange(len(unambig)-1):
             a = textutils.RichString(ambig[i][1:-1])
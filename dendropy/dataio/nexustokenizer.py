@@ -22,6 +22,7 @@ by both `dendropy.newick` and `dendropy.nexus` modules.
 """
 
 import re
+import mmap
 from cStringIO import StringIO
 from dendropy import Annotation
 from dendropy.utility import containers
@@ -34,6 +35,10 @@ _LOG = messaging.get_logger(__name__)
 ## Should hyphens be treated as independent tokens by default?
 DEFAULT_HYPHENS_AS_TOKENS = False
 
+###############################################################################
+## Number of characters pulled from the underlying stream at a time
+STREAM_READ_BUFFER_SIZE = 65536
+
 ###############################################################################
 ## annotations to comments and vice versa
 
@@ -543,13 +548,15 @@ class NexusTokenizer(object):
     whitespace = ' \0\t\n\r'
     multi_char_needs_quoting = re.compile(' \0\t\n\r\(\)\[\]\{\}\\\/\,\;\:\=\*\'\"\`\+\-\<\>_')
     single_char_needs_quoting = re.compile(' \0\t\n\r\[\'_')
+    whitespace_pattern = re.compile('[' + whitespace + ']')
+    punctuation_pattern = re.compile('[' + punctuation + ']')
     def is_whitespace(char):
         return char in NexusTokenizer.whitespace
 
     is_whitespace = staticmethod(is_whitespace)
 
     def has_whitespace(s):
-        return re.search('['+NexusTokenizer.whitespace+']', s) != None
+        return NexusTokenizer.whitespace_pattern.search(s) != None
 
     has_whitespace = staticmethod(has_whitespace)
 
@@ -559,7 +566,7 @@ class NexusTokenizer(object):
     is_punctuation = staticmethod(is_punctuation)
 
     def has_punctuation(s):
-        return re.search('['+NexusTokenizer.punctuation+']', s) != None
+        return NexusTokenizer.punctuation_pattern.search(s) != None
 
     has_punctuation = staticmethod(has_punctuation)
 
@@ -583,6 +590,29 @@ class NexusTokenizer(object):
 
     validate_identifier = staticmethod(validate_identifier)
 
+    _plain_run_patterns = {}
+    def plain_run_pattern(ignore_punctuation=None, special_chars=None):
+        """
+        Returns a (cached) compiled regular expression that matches a run of
+        characters that can be added to the current token without any
+        special handling: i.e., anything other than whitespace, punctuation
+        (except for punctuation given in `ignore_punctuation`), comment
+        delimiters, underscores (which may need to be converted to spaces),
+        or any of the additional characters given in `special_chars`.
+        """
+        key = (frozenset(ignore_punctuation or ()), frozenset(special_chars or ()))
+        pattern = NexusTokenizer._plain_run_patterns.get(key)
+        if pattern is None:
+            excluded = set(NexusTokenizer.whitespace)
+            excluded.update(set(NexusTokenizer.punctuation) - key[0])
+            excluded.update(key[1])
+            excluded.update('[_')
+            pattern = re.compile("[^%s]+" % "".join(re.escape(c) for c in sorted(excluded)))
+            NexusTokenizer._plain_run_patterns[key] = pattern
+        return pattern
+
+    plain_run_pattern = staticmethod(plain_run_pattern)
+
     #######################################################################
     ## INSTANCE METHODS
 
@@ -624,6 +654,70 @@ class NexusTokenizer(object):
 
     hyphens_as_tokens = property(_get_hyphens_as_tokens, _set_hyphens_as_tokens)
 
+    def _get_stream_handle(self):
+        return self._stream_handle
+
+    def _set_stream_handle(self, stream_handle):
+        self._stream_handle = stream_handle
+        if isinstance(stream_handle, mmap.mmap):
+            # memory-mapped sources are scanned in place rather than being
+            # copied out block by block; the map is moved to its end so
+            # that it reports exhaustion once the buffer is consumed
+            self._buffer = stream_handle
+            self._buffer_pos = stream_handle.tell()
+            stream_handle.seek(0, 2)
+        else:
+            self._buffer = ""
+            self._buffer_pos = 0
+
+    stream_handle = property(_get_stream_handle, _set_stream_handle)
+
+    def _read_buffered_char(self):
+        """
+        Returns the next character from the underlying stream, which is
+        read in blocks of `STREAM_READ_BUFFER_SIZE` characters (or used
+        directly, if it is a `mmap.mmap` object), or an empty string if the
+        end of the stream has been reached.
+        """
+        if self._buffer_pos >= len(self._buffer):
+            self._buffer = self._stream_handle.read(STREAM_READ_BUFFER_SIZE)
+            self._buffer_pos = 0
+            if not self._buffer:
+                return ''
+        c = self._buffer[self._buffer_pos]
+        self._buffer_pos += 1
+        return c
+
+    def _consume_plain_run(self, pattern):
+        """
+        Consumes the run of characters starting with the current character
+        that is matched by `pattern` (see `plain_run_pattern()`), and returns
+        it. On return, the current character is the first character following
+        the run. Line and column bookkeeping is identical to reading each
+        character in turn using `read_next_char()`.
+        """
+        start = self._buffer_pos - 1
+        m = None
+        if start >= 0 and self._buffer[start] == self._current_file_char:
+            m = pattern.match(self._buffer, start)
+        if m is None:
+            run = self._current_file_char
+        else:
+            run = m.group()
+        k = len(run)
+        if k > 1:
+            # the run holds no newlines, so only the character preceding it
+            # can trigger a line increment
+            if self.previous_file_char == '\n':
+                self.current_line_number = self.current_line_number + 1
+                self.current_col_number = 0
+            self.current_col_number += k - 1
+            self.previous_file_char = run[-2]
+            self._current_file_char = run[-1]
+            self._buffer_pos = start + k
+        self.read_next_char()
+        return run
+
     def _get_current_file_char(self):
         "Returns the current character from the file stream."
         if self._current_file_char == None:
@@ -660,8 +754,8 @@ class NexusTokenizer(object):
         Advances the file stream cursor to the next character and returns
         it.
         """
-        if self.stream_handle:
-            read_char = self.stream_handle.read(1) # returns empty string if EOF
+        if self._stream_handle:
+            read_char = self._read_buffered_char() # returns empty string if EOF
             if read_char == '':
                 self.eof = True
                 if not self.allow_eof:
@@ -691,7 +785,7 @@ class NexusTokenizer(object):
             self._comment_metadata.clear()
 
     def _raw_read_next_char(self):
-            read_char = self.stream_handle.read(1) # returns empty string if EOF
+            read_char = self._read_buffered_char() # returns empty string if EOF
             if read_char == '':
                 raise StopIteration()
             if self.previous_file_char == '\n':
@@ -814,6 +908,8 @@ class NexusTokenizer(object):
                 else:
                     token = StringIO()
                     quick_check = NexusTokenizer.is_whitespace_or_punctuation
+                    consume_run = self._consume_plain_run
+                    run_pattern = NexusTokenizer.plain_run_pattern(ignore_punctuation, '{(')
                     while True:
                         if c == '{' or c == '(':
 #                            token.write(c)
@@ -840,6 +936,14 @@ class NexusTokenizer(object):
                                     token.write(c)
                                     num_chars_read += 1
                                 break
+                        elif c != '_':
+                            run = consume_run(run_pattern)
+                            token.write(run)
+                            num_chars_read += len(run)
+                            c = self._current_file_char
+                            if not c:
+                                break
+                            continue
                         if c == '_' and not self.preserve_underscores:
                             c = ' '
                         token.write(c)
@@ -912,6 +1016,8 @@ class NexusTokenizer(object):
                 else:
                     token = StringIO()
                     quick_check = NexusTokenizer.is_whitespace_or_punctuation
+                    consume_run = self._consume_plain_run
+                    run_pattern = NexusTokenizer.plain_run_pattern(ignore_punctuation)
                     while True:
                         if quick_check(c):
                             if c == '[':
@@ -922,6 +1028,12 @@ class NexusTokenizer(object):
                                 if not NexusTokenizer.is_whitespace(c):
                                     token.write(c)
                                 break
+                        elif c != '_':
+                            token.write(consume_run(run_pattern))
+                            c = self._current_file_char
+                            if not c:
+                                break
+                            continue
                         if c == '_' and not self.preserve_underscores:
                             c = ' '
                         token.write(c)
@@ -1003,6 +1115,8 @@ class NexusTokenizer(object):
             token = StringIO()
             fget = self.read_next_char
             quick_check = NexusTokenizer.is_whitespace_or_punctuation
+            consume_run = self._consume_plain_run
+            run_pattern = NexusTokenizer.plain_run_pattern(ignore_punctuation)
             if ignore_punctuation:
                 while True:
                     if quick_check(c):
@@ -1012,6 +1126,12 @@ class NexusTokenizer(object):
                             continue
                         if quick_check(c) and not c in ignore_punctuation:
                             break
+                    elif c != '_':
+                        token.write(consume_run(run_pattern))
+                        c = self._current_file_char
+                        if not c:
+                            break
+                        continue
                     if c == '_' and not self.preserve_underscores:
                         c = ' '
                     token.write(c)
@@ -1026,6 +1146,12 @@ class NexusTokenizer(object):
                             c = self.current_file_char
                             continue
                         break
+                    elif c != '_':
+                        token.write(consume_run(run_pattern))
+                        c = self._current_file_char
+                        if not c:
+                            break
+                        continue
                     if c == '_' and not self.preserve_underscores:
                         c = ' '
                     token.write(c)
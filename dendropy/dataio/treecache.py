@@ -0,0 +1,154 @@
+#! /usr/bin/env python
+
+##############################################################################
+##  DendroPy Phylogenetic Computing Library.
+##
+##  Copyright 2010 Jeet Sukumaran and Mark T. Holder.
+##  All rights reserved.
+##
+##  See "LICENSE.txt" for terms and conditions of usage.
+##
+##  If you use this work or any portion thereof in published work,
+##  please cite it as:
+##
+##     Sukumaran, J. and M. T. Holder. 2010. DendroPy: a Python library
+##     for phylogenetic computing. Bioinformatics 26: 1569-1571.
+##
+##############################################################################
+
+"""
+Compact binary cache of tree collections, for fast reloading of trees that
+have already been parsed from a text source.
+
+Each tree is stored as flat, parallel lists describing its nodes in
+preorder: the index of the parent of each node (-1 for the seed node), the
+index of the taxon associated with each node in the taxon set (-1 if none),
+the node labels and the edge lengths. Together with the taxon labels and
+the label, rooting state and weight of each tree, this is written using
+`marshal`, so loading the cache does not involve any tokenizing or
+parsing. Other information, such as annotations, comments or split
+bitmasks, is not stored. The cache format is specific to the version of
+Python used to write it, and is intended for caching only, not for
+archiving or exchanging data.
+"""
+
+import marshal
+from dendropy import dataobject
+from dendropy.utility import error
+
+###############################################################################
+## Constants
+
+TREE_CACHE_FORMAT_VERSION = 1
+
+###############################################################################
+## Dumping and loading
+
+def dump_tree_list(tree_list, stream):
+    """
+    Writes the trees of `tree_list` and the labels of the taxa of its
+    `TaxonSet` to the binary file-like object `stream`.
+    """
+    taxon_indexes = {}
+    for idx, taxon in enumerate(tree_list.taxon_set):
+        taxon_indexes[taxon] = idx
+    trees = []
+    for tree in tree_list:
+        node_indexes = {}
+        parents = []
+        taxa = []
+        labels = []
+        edge_lengths = []
+        for nd in tree.preorder_node_iter():
+            node_indexes[nd] = len(parents)
+            if nd.parent_node is None:
+                parents.append(-1)
+            else:
+                parents.append(node_indexes[nd.parent_node])
+            if nd.taxon is None:
+                taxa.append(-1)
+            else:
+                taxa.append(taxon_indexes[nd.taxon])
+            labels.append(nd.label)
+            edge_lengths.append(nd.edge.length)
+        trees.append((tree.label,
+                tree.is_rooted,
+                tree.weight,
+                parents,
+                taxa,
+                labels,
+                edge_lengths))
+    taxon_labels = [taxon.label for taxon in tree_list.taxon_set]
+    stream.write(marshal.dumps((TREE_CACHE_FORMAT_VERSION, tree_list.label, taxon_labels, trees), 2))
+
+def load_tree_list(stream, taxon_set=None):
+    """
+    Reads trees written by `dump_tree_list()` from the binary file-like
+    object `stream`, and returns them in a new `TreeList`. If `taxon_set`
+    is not given, then a new `TaxonSet` is created, with a new taxon for
+    each of the taxa stored. Otherwise, each stored taxon is matched to the
+    taxon at the same position in `taxon_set` if their labels are the same
+    (so unlabelled taxa are matched if the trees are loaded into the
+    `TaxonSet` they were dumped from), or else looked up in `taxon_set` by
+    label, or else, if `taxon_set` is not locked, created in it.
+    """
+    try:
+        version, tree_list_label, taxon_labels, trees = marshal.loads(stream.read())
+    except (EOFError, ValueError, TypeError):
+        raise error.DataParseError(message="Not a valid tree cache", stream=stream)
+    if version != TREE_CACHE_FORMAT_VERSION:
+        raise error.DataParseError(message="Unsupported tree cache format version: %s" % version, stream=stream)
+    if taxon_set is None:
+        taxon_set = dataobject.TaxonSet()
+        taxa = [taxon_set.new_taxon(label=label) for label in taxon_labels]
+    else:
+        taxa = _map_taxa(taxon_labels, taxon_set, stream)
+    tree_list = dataobject.TreeList(taxon_set=taxon_set, label=tree_list_label)
+    for tree_label, is_rooted, weight, parents, taxon_indexes, labels, edge_lengths in trees:
+        tree = dataobject.Tree(taxon_set=taxon_set, label=tree_label)
+        tree.is_rooted = is_rooted
+        tree.weight = weight
+        nodes = []
+        for idx, parent_idx in enumerate(parents):
+            taxon_idx = taxon_indexes[idx]
+            if taxon_idx < 0:
+                taxon = None
+            else:
+                taxon = taxa[taxon_idx]
+            if parent_idx < 0:
+                nd = tree.seed_node
+                nd.taxon = taxon
+                nd.label = labels[idx]
+                nd.edge.length = edge_lengths[idx]
+            else:
+                nd = dataobject.Node(taxon=taxon, label=labels[idx])
+                nodes[parent_idx].add_child(nd, edge_length=edge_lengths[idx])
+            nodes.append(nd)
+        tree_list.append(tree, reindex_taxa=False)
+    return tree_list
+
+def _map_taxa(taxon_labels, taxon_set, stream):
+    """
+    Returns a list of the taxa of `taxon_set` that correspond to the stored
+    taxa with the labels `taxon_labels`, as described in `load_tree_list()`.
+    """
+    taxa = []
+    num_taxa = len(taxon_set)
+    for idx, label in enumerate(taxon_labels):
+        taxon = None
+        if idx < num_taxa and taxon_set[idx].label == label:
+            taxon = taxon_set[idx]
+        elif label is not None:
+            taxon = taxon_set.get_taxon(label=label)
+        if taxon is None:
+            try:
+                taxon = taxon_set.new_taxon(label=label)
+            except KeyError:
+                if label is None:
+                    desc = "Unlabelled taxon %d" % (idx + 1)
+                else:
+                    desc = "Taxon '%s'" % label
+                raise error.DataParseError(message="%s not in TaxonSet, and cannot be created because TaxonSet is immutable" % desc,
+                        stream=stream)
+        taxa.append(taxon)
+    return taxa
@@ -34,11 +34,9 @@ class DataObject(object):
 
     def __init__(self, label=None, oid=None):
         self.label = label
-        if oid is not None:
-            self._oid = oid
-        else:
-            self._oid = self._default_oid()
-        self._annotations = AnnotationSet(self)
+        # if not given, the default oid is only built when it is first
+        # asked for, as most objects never need one
+        self._oid = oid
 
     def _default_oid(self):
         "Returns default oid."
@@ -47,6 +45,8 @@ class DataObject(object):
 
     def _get_oid(self):
         "Returns id."
+        if self._oid is None:
+            self._oid = self._default_oid()
         return self._oid
     def _set_oid(self, oid):
         """
@@ -54,20 +54,18 @@ class DataObject(object):
         to xs:NCName specs if neccessary), otherwise sets to some
         other oidue.
         """
-        if oid is not None:
-            self._oid = oid
-        else:
-            self._oid = self._default_oid()
+        self._oid = oid
     oid = property(_get_oid, _set_oid)
 
     def reset_oid(self):
-        self._oid = self._default_oid
-        return self._oid
+        self._oid = None
+        return self.oid
 
     def __deepcopy__(self, memo):
         o = self.__class__(label=self.label, oid=None)
         memo[id(self)] = o
-        memo[id(self._oid)] = o._oid
+        if self._oid is not None:
+            memo[id(self._oid)] = o._oid
         memo[id(self.label)] = o.label
         for k, v in self.__dict__.iteritems():
             o.__dict__[copy.deepcopy(k, memo)] = copy.deepcopy(v, memo)
@@ -80,8 +78,10 @@ class AnnotatedDataObject(DataObject):
     """
 
     def __init__(self, label=None, oid=None):
+        # the `AnnotationSet` is only created when `annotations` is first
+        # accessed, as most objects (e.g., the cells of a character matrix)
+        # are never annotated
         DataObject.__init__(self, label=label, oid=oid)
-        self._annotations = AnnotationSet(self)
 
     def _get_annotations(self):
         if not hasattr(self, "_annotations"):
@@ -107,9 +107,15 @@ class AnnotatedDataObject(DataObject):
 
     def __deepcopy__(self, memo):
 
+        # an object that has never been annotated has no `AnnotationSet`
+        # to copy, and the copy will create its own when needed
+        annotations = getattr(self, "_annotations", None)
+        if annotations is None:
+            return DataObject.__deepcopy__(self, memo)
+
         # temporary disable deepcopying of annotations
         # until target object is created
-        memo[id(self.annotations)] = None
+        memo[id(annotations)] = None
 
         # copy object
         o = DataObject.__deepcopy__(self, memo)
@@ -119,10 +125,10 @@ class AnnotatedDataObject(DataObject):
         # annotations_copy = copy.deepcopy(self.annotations, memo)
         # o._annotations = annotations_copy
         # memo[id(self.annotations)] = o._annotations
-        del memo[id(self._annotations)]
-        annotations_copy = copy.deepcopy(self._annotations, memo)
+        del memo[id(annotations)]
+        annotations_copy = copy.deepcopy(annotations, memo)
         o.annotations = annotations_copy
-        memo[id(self._annotations)] = o._annotations
+        memo[id(annotations)] = o._annotations
 
         # return
         return o
@@ -29,6 +29,17 @@ from dendropy.utility import textutils
 from dendropy.utility import containers
 from dendropy.utility import error
 
+def intern_label(label):
+    """
+    Returns the interned copy of `label` if it is a plain (byte) string, so
+    that every reference to a given label shares a single string object and
+    label comparisons can succeed on identity. Other values (e.g., `None` or
+    `unicode` labels, which cannot be interned) are returned unchanged.
+    """
+    if type(label) is str:
+        return intern(label)
+    return label
+
 def new_taxon_set(ntax=10, label_func=None):
     """
     Generates a new set of Taxon objects. `label_func` should be a function
@@ -172,6 +183,8 @@ class TaxonSet(containers.OrderedSet, base.AnnotatedDataObject):
                 else:
                     self.add(TaxonSet._to_taxon(i))
         self._is_mutable = kwargs.get('is_mutable', True) # immutable constraints not fully implemented -- only enforced at the add_taxon stage)
+        self._is_frozen = False
+        self._frozen_label_maps = None
 
     def __deepcopy__(self, memo):
         """
@@ -186,6 +199,8 @@ class TaxonSet(containers.OrderedSet, base.AnnotatedDataObject):
         if memo is None:
             memo = {}
         o = base.AnnotatedDataObject.__deepcopy__(self, memo)
+        o._is_frozen = False
+        o._frozen_label_maps = None
         for taxon in self:
             o.add(taxon.fullcopy(memo))
         memo[id(self)] = o
@@ -205,6 +220,91 @@ class TaxonSet(containers.OrderedSet, base.AnnotatedDataObject):
 
     def unlock(self):
         self._is_mutable = True
+        self._is_frozen = False
+        self._frozen_label_maps = None
+
+    def freeze(self):
+        """
+        Locks this `TaxonSet` (see `lock()`) and indexes its taxa by label,
+        so that subsequent label lookups through `get_taxon()` and
+        `require_taxon()` (e.g., when reading further data sources into
+        the same taxa) are single dictionary lookups instead of scans of
+        the whole set. The index is discarded and rebuilt on the next lookup
+        if taxa are added to or removed from the set, and lookups that find
+        a taxon that has since been relabelled, or that find nothing, fall
+        back to a scan of the set.
+        """
+        self.lock()
+        self._is_frozen = True
+        self._index_labels()
+
+    def _index_labels(self):
+        label_map = {}
+        label_map_ci = {}
+        for taxon in self:
+            if taxon.label is not None:
+                label_map.setdefault(taxon.label, taxon)
+                label_map_ci.setdefault(taxon.label.lower(), taxon)
+        self._frozen_label_maps = (label_map, label_map_ci)
+        return self._frozen_label_maps
+
+    def unfreeze(self):
+        """
+        Discards the label index built by `freeze()` and unlocks this
+        `TaxonSet`.
+        """
+        self.unlock()
+
+    def _get_is_frozen(self):
+        return self._is_frozen
+    is_frozen = property(_get_is_frozen)
+
+    # any change to the membership or order of the taxa discards the label
+    # index of a frozen `TaxonSet`
+
+    def add(self, x):
+        self._frozen_label_maps = None
+        return containers.OrderedSet.add(self, x)
+
+    def update(self, x):
+        self._frozen_label_maps = None
+        containers.OrderedSet.update(self, x)
+
+    def append(self, x):
+        self._frozen_label_maps = None
+        containers.OrderedSet.append(self, x)
+
+    def insert(self, i, x):
+        self._frozen_label_maps = None
+        containers.OrderedSet.insert(self, i, x)
+
+    def remove(self, x):
+        self._frozen_label_maps = None
+        containers.OrderedSet.remove(self, x)
+
+    def pop(self, *args):
+        self._frozen_label_maps = None
+        return containers.OrderedSet.pop(self, *args)
+
+    def __delitem__(self, i):
+        self._frozen_label_maps = None
+        containers.OrderedSet.__delitem__(self, i)
+
+    def __delslice__(self, i, j):
+        self._frozen_label_maps = None
+        containers.OrderedSet.__delslice__(self, i, j)
+
+    def __iadd__(self, x):
+        self._frozen_label_maps = None
+        return containers.OrderedSet.__iadd__(self, x)
+
+    def sort(self, *args, **kwargs):
+        self._frozen_label_maps = None
+        containers.OrderedSet.sort(self, *args, **kwargs)
+
+    def reverse(self):
+        self._frozen_label_maps = None
+        containers.OrderedSet.reverse(self)
 
     def get_is_locked(self):
         return self._is_mutable
@@ -260,10 +360,35 @@ class TaxonSet(containers.OrderedSet, base.AnnotatedDataObject):
         if "oid" not in kwargs and "label" not in kwargs:
             raise TypeError("Need to specify Taxon oid or label.")
         oid = kwargs.get("oid", None)
-        label = kwargs.get("label", None)
+        label = intern_label(kwargs.get("label", None))
         ci = kwargs.get("case_insensitive", False)
         if ci:
             label_lower = label.lower()
+        else:
+            label_lower = None
+        if oid is None and label is not None and self._is_frozen:
+            label_maps = self._frozen_label_maps
+            if label_maps is None:
+                label_maps = self._index_labels()
+            if ci:
+                taxon = label_maps[1].get(label_lower)
+                if taxon is not None and taxon.label is not None \
+                        and taxon.label.lower() == label_lower:
+                    return taxon
+            else:
+                taxon = label_maps[0].get(label)
+                if taxon is not None and taxon.label == label:
+                    return taxon
+            # nothing found, or the taxon found has been relabelled: the
+            # index may be out of date, so scan the set, and re-index on the
+            # next lookup if the scan finds something different
+            found = self._find_taxon(oid, label, ci, label_lower)
+            if found is not taxon:
+                self._frozen_label_maps = None
+            return found
+        return self._find_taxon(oid, label, ci, label_lower)
+
+    def _find_taxon(self, oid, label, ci, label_lower):
         for taxon in self:
             if (oid is not None and taxon.oid == oid) \
                     or (label is not None and taxon.label == label) \
@@ -503,7 +628,7 @@ class Taxon(base.AnnotatedDataObject):
         else:
             self.label = None
         if label is not None:
-            self.label = label
+            self.label = intern_label(label)
         self.oid = oid
 
     def __str__(self):
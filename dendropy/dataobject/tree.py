@@ -22,9 +22,11 @@ as well as all the structural classes that make up a tree.
 """
 
 from cStringIO import StringIO
+import os
 import copy
 import bisect
 import re
+from collections import deque
 
 from dendropy.utility import messaging
 _LOG = messaging.get_logger(__name__)
@@ -55,6 +57,24 @@ class TreeList(list, TaxonSetLinked, iosys.Readable, iosys.Writeable):
         return tlist
     _parse_from_stream = classmethod(_parse_from_stream)
 
+    def get_from_paths(cls, paths, schema, **kwargs):
+        """
+        Factory method to return a new TreeList populated with the trees
+        of each of the files given by the strings in `paths`, in the order
+        in which the paths are given. All the files are read into the same
+        `TreeList`, so that all the trees share the same `TaxonSet` (which
+        can be specified using the `taxon_set` keyword argument) and taxa
+        are only resolved once per label rather than once per file. Other
+        keyword arguments are passed to `read()` for each file in turn.
+        """
+        tlist = cls()
+        for path in paths:
+            tlist.read_from_path(path,
+                    schema=schema,
+                    **kwargs)
+        return tlist
+    get_from_paths = classmethod(get_from_paths)
+
     def __init__(self, *args, **kwargs):
         """
         __init__ creates a new TreeList object, populating it with any iterable
@@ -105,6 +125,7 @@ class TreeList(list, TaxonSetLinked, iosys.Readable, iosys.Writeable):
             # is the use the `get_from_*` family of static factory methods
             tlst7 = TreeList.get_from_stream(open('treefile.tre', 'rU'), "newick")
             tlst8 = TreeList.get_from_path('sometrees.nexus', "nexus")
+            tlst8b = TreeList.get_from_paths(['run1.nexus', 'run2.nexus'], "nexus")
             tlst9 = TreeList.get_from_string("((A,B),(C,D));((A,C),(B,D));", "newick")
 
             # can also call `read()` on a TreeList object; each read adds the
@@ -244,6 +265,36 @@ class TreeList(list, TaxonSetLinked, iosys.Readable, iosys.Writeable):
         d.add(self)
         d.write(stream=stream, schema=schema, **kwargs)
 
+    def dump_binary(self, dest):
+        """
+        Writes the trees of this `TreeList` to the file specified by `dest`
+        in the compact binary cache format of `dendropy.dataio.treecache`,
+        from which they can be quickly reloaded using `load_binary()`. Only
+        the tree topologies, taxa, node labels, edge lengths, rooting states
+        and weights are stored.
+        """
+        from dendropy.dataio import treecache
+        f = open(os.path.expandvars(os.path.expanduser(dest)), "wb")
+        try:
+            treecache.dump_tree_list(self, f)
+        finally:
+            f.close()
+
+    def load_binary(cls, src, taxon_set=None):
+        """
+        Factory method to return a new `TreeList` populated with the trees
+        written by `dump_binary()` to the file specified by `src`. If
+        `taxon_set` is given, it will be used to manage the taxa of the
+        trees (see `dendropy.dataio.treecache.load_tree_list()`).
+        """
+        from dendropy.dataio import treecache
+        f = open(os.path.expandvars(os.path.expanduser(src)), "rb")
+        try:
+            return treecache.load_tree_list(f, taxon_set=taxon_set)
+        finally:
+            f.close()
+    load_binary = classmethod(load_binary)
+
     def reindex_subcomponent_taxa(self):
         """
         Synchronizes `TaxonSet` of member trees to `taxon_set` of self.
@@ -1238,31 +1289,33 @@ class Tree(TaxonSetLinked, iosys.Readable, iosys.Writeable):
         `delete_outdegree_one` is False, then it will be
         removed from the tree.
         """
-        from dendropy import treecalc
-        pdm = treecalc.PatristicDistanceMatrix(self)
-        n1, n2 = pdm.max_dist_nodes
-        plen = float(pdm.max_dist) / 2
-        mrca_node = pdm.mrca(n1.taxon, n2.taxon)
-        #assert mrca_node is self.mrca(taxa=[n1.taxon, n2.taxon])
-        #mrca_node = self.mrca(taxa=[n1.taxon, n2.taxon])
+        n1, n2, mrca_node, max_dist = self._find_max_dist_nodes()
+        plen = float(max_dist) / 2
+        # lengths within this of each other are taken to be equal, so that
+        # rounding errors in summing the edge lengths do not carry the
+        # midpoint past a node at which it actually lies
+        tolerance = float(max_dist) * 1e-10
         cur_node = n1
 
-        break_on_node = None # populated *iff* midpoint is exactly at an existing node
+        break_on_node = None # populated *iff* midpoint is (at) an existing node
         target_edge = None
         head_node_edge_len = None
 
         # going up ...
         while cur_node is not mrca_node:
-            if cur_node.edge.length > plen:
+            if cur_node.edge.length - plen > tolerance:
                 target_edge = cur_node.edge
                 head_node_edge_len = plen #cur_node.edge.length - plen
                 plen = 0
                 break
-            elif cur_node.edge.length < plen:
-                plen -= cur_node.edge.length
-                cur_node = cur_node.parent_node
-            else:
+            plen -= cur_node.edge.length
+            cur_node = cur_node.parent_node
+            if plen <= tolerance:
                 break_on_node = cur_node
+                break
+        else:
+            # n1 and n2 are equally far from their mrca
+            break_on_node = mrca_node
 
         assert break_on_node is not None or target_edge is not None
 
@@ -1283,6 +1336,44 @@ class Tree(TaxonSetLinked, iosys.Readable, iosys.Writeable):
             self.update_splits(delete_outdegree_one=False)
         return self.seed_node
 
+    def _find_max_dist_nodes(self):
+        """
+        Returns a tuple, (`n1`, `n2`, `mrca_node`, `max_dist`), where `n1`
+        and `n2` are the two leaves separated by the longest path in the
+        tree, `mrca_node` is the node at which their lineages join and
+        `max_dist` is the length of the path. `n1` is the leaf on the
+        longer side of `mrca_node` (or either, if both sides are equally
+        long), so that the midpoint of the path lies between `n1` and
+        `mrca_node`.
+        The path is found in a single postorder pass, keeping only the
+        deepest leaf under each node, rather than by tabulating all
+        pairwise distances.
+        """
+        deepest = {}
+        max_dist = None
+        max_dist_nodes = None
+        for nd in self.postorder_node_iter():
+            if not nd._child_nodes:
+                deepest[nd] = (0, nd)
+                continue
+            best = None
+            for ch in nd._child_nodes:
+                ch_depth, ch_leaf = deepest.pop(ch)
+                ch_depth += ch.edge.length
+                if best is not None:
+                    pat_dist = best[0] + ch_depth
+                    if max_dist is None or pat_dist > max_dist:
+                        max_dist = pat_dist
+                        if best[0] >= ch_depth:
+                            max_dist_nodes = (best[1], ch_leaf, nd)
+                        else:
+                            max_dist_nodes = (ch_leaf, best[1], nd)
+                if best is None or ch_depth > best[0]:
+                    best = (ch_depth, ch_leaf)
+            deepest[nd] = best
+        n1, n2, mrca_node = max_dist_nodes
+        return n1, n2, mrca_node, max_dist
+
     def delete_outdegree_one_nodes(self):
         for nd in self.postorder_node_iter():
             children = nd.child_nodes()
@@ -1422,6 +1513,7 @@ class Tree(TaxonSetLinked, iosys.Readable, iosys.Writeable):
             for ch in children:
                 if ch not in nodes_to_retain:
                     nd._child_nodes.remove(ch)
+                    nd._invalidate_subtree_size()
                     # ch.edge.tail_node.remove_child(ch)
             to_process.extend(nd._child_nodes)
         if delete_outdegree_one:
@@ -1514,17 +1606,9 @@ class Tree(TaxonSetLinked, iosys.Readable, iosys.Writeable):
         descending (if ``ascending`` is ``False``) order in terms of the number of
         children each child node has.
         """
-        node_desc_counts = {}
         for nd in self.postorder_node_iter():
-            if len(nd._child_nodes) == 0:
-                node_desc_counts[nd] = 0
-            else:
-                total = 0
-                for child in nd._child_nodes:
-                    total += node_desc_counts[child]
-                total += len(nd._child_nodes)
-                node_desc_counts[nd] = total
-                nd._child_nodes.sort(key=lambda n: node_desc_counts[n], reverse=not ascending)
+            if nd._child_nodes:
+                nd._child_nodes.sort(key=Node._get_subtree_size, reverse=not ascending)
 
     def update_splits(self, **kwargs):
         """
@@ -2158,6 +2242,7 @@ class Node(TaxonLinked):
         self._edge = None
         self._child_nodes = []
         self._parent_node = None
+        self._cached_subtree_size = None
         if edge is not None:
             self.edge = edge
         else:
@@ -2188,14 +2273,17 @@ class Node(TaxonLinked):
         only returned if no filter_fn is given or if filter_fn returns
         True.
         """
+        # the next node to visit is kept at the *end* of the stack so that
+        # each step is a constant-time pop/extend rather than a copy of the
+        # whole stack
         stack = [self]
         while stack:
-            node = stack.pop(0)
+            node = stack.pop()
             if filter_fn is None or filter_fn(node):
                 yield node
             child_nodes = node.child_nodes()
-            child_nodes.extend(stack)
-            stack = child_nodes
+            child_nodes.reverse()
+            stack.extend(child_nodes)
 
     def postorder_iter(self, filter_fn=None):
         """
@@ -2205,17 +2293,19 @@ class Node(TaxonLinked):
         node is only returned if no filter_fn is given or if filter_fn
         returns True.
         """
+        # as in `preorder_iter()`, the next node to visit is at the end of
+        # the stack
         stack = [(self, False)]
         while stack:
-            node, state = stack.pop(0)
+            node, state = stack.pop()
             if state:
                 if filter_fn is None or filter_fn(node):
                     yield node
             else:
-                stack.insert(0, (node, True))
+                stack.append((node, True))
                 child_nodes = [(n, False) for n in node.child_nodes()]
-                child_nodes.extend(stack)
-                stack = child_nodes
+                child_nodes.reverse()
+                stack.extend(child_nodes)
 
     def leaf_iter(self, filter_fn=None):
         """
@@ -2237,9 +2327,9 @@ class Node(TaxonLinked):
         """
         if filter_fn is None or filter_fn(self):
             yield self
-        remaining = self.child_nodes()
-        while len(remaining) > 0:
-            node = remaining.pop(0)
+        remaining = deque(self.child_nodes())
+        while remaining:
+            node = remaining.popleft()
             if filter_fn is None or filter_fn(node):
                 yield node
             child_nodes = node.child_nodes()
@@ -2444,6 +2534,7 @@ class Node(TaxonLinked):
             - sets the tail node of each child to self
         """
         self._child_nodes = list(child_nodes)
+        self._invalidate_subtree_size()
         for nidx in range(len(self._child_nodes)):
             self._child_nodes[nidx].parent_node = self
             self._child_nodes[nidx].edge.tail_node = self
@@ -2452,6 +2543,37 @@ class Node(TaxonLinked):
         """Legacy support: delegates to `set_child_nodes()`"""
         return self.set_child_nodes(child_nodes)
 
+    def _get_subtree_size(self):
+        """
+        Returns the number of nodes descending from this node. The count is
+        cached on each node of the subtree, and the cached values of a node
+        and its ancestors are discarded whenever its children change, so
+        that repeated calls on an unchanged (sub)tree do not re-traverse it.
+        """
+        if self._cached_subtree_size is None:
+            stack = [self]
+            while stack:
+                nd = stack[-1]
+                pending = [ch for ch in nd._child_nodes if ch._cached_subtree_size is None]
+                if pending:
+                    stack.extend(pending)
+                    continue
+                total = len(nd._child_nodes)
+                for ch in nd._child_nodes:
+                    total += ch._cached_subtree_size
+                nd._cached_subtree_size = total
+                stack.pop()
+        return self._cached_subtree_size
+
+    def _invalidate_subtree_size(self):
+        """
+        Discards the cached subtree size of this node and of its ancestors.
+        """
+        nd = self
+        while nd is not None and nd._cached_subtree_size is not None:
+            nd._cached_subtree_size = None
+            nd = nd._parent_node
+
     def _get_parent_node(self):
         """Returns the parent node of this node."""
         return self._parent_node
@@ -2502,6 +2624,7 @@ class Node(TaxonLinked):
         node.parent_node = self
         if edge_length != None:
             node.edge_length = edge_length
+        self._invalidate_subtree_size()
         if pos is None:
             self._child_nodes.append(node)
         else:
@@ -2533,6 +2656,7 @@ class Node(TaxonLinked):
         if node in children:
             node.parent_node = None
             node.edge.tail_node = None
+            self._invalidate_subtree_size()
             index = children.index(node)
 #             if index > 0:
 #                 self._child_nodes[index-1].next_sib = None
@@ -2549,6 +2673,7 @@ class Node(TaxonLinked):
                         except:
                             pass
                         self._child_nodes = []
+                        self._invalidate_subtree_size()
                 else:
                     to_remove = None
                     if len(children) == 2:
@@ -2570,6 +2695,7 @@ class Node(TaxonLinked):
                         for c in tr_children:
                             self.add_child(c, pos=pos)
                         to_remove._child_nodes = []
+                        to_remove._invalidate_subtree_size()
         else:
             raise Exception("Tried to remove a node that is not listed as a child")
         return node
@@ -2601,6 +2727,7 @@ class Node(TaxonLinked):
 #             if index > 0:
 #                 self._child_nodes[index-1].next_sib = None
         children.remove(node)
+        self._invalidate_subtree_size()
         if suppress_deg_two:
             p = self.parent_node
             if p:
@@ -2609,6 +2736,7 @@ class Node(TaxonLinked):
                     pos = p._child_nodes.index(self)
                     p.add_child(child, pos=pos)
                     self._child_nodes = []
+                    self._invalidate_subtree_size()
                     p.remove_child(self, suppress_deg_two=False)
                     e = child.edge
                     try:
@@ -2636,6 +2764,7 @@ class Node(TaxonLinked):
                     self.remove_child(to_remove, suppress_deg_two=False)
                     tr_children = to_remove._child_nodes
                     to_remove._child_nodes = []
+                    to_remove._invalidate_subtree_size()
                     for n, c in enumerate(tr_children):
                         new_pos = pos + n
                         self.add_child(c, pos=new_pos)
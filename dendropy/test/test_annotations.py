@@ -320,6 +320,38 @@ class NexmlAnnotations(datatest.AnnotatedDataObjectVerificationTestCase):
     #     dataset2 = dendropy.DataSet(dataset1)
     #     self.verify_dataset(dataset2)
 
+class LazyAnnotationSetTest(datatest.AnnotatedDataObjectVerificationTestCase):
+
+    def testUnannotatedCopy(self):
+        cell = dendropy.CharacterDataCell(value="A")
+        cell_copy = copy.deepcopy(cell)
+        self.assertFalse(hasattr(cell, "_annotations"))
+        self.assertFalse(hasattr(cell_copy, "_annotations"))
+        self.assertEqual(len(cell_copy.annotations), 0)
+        self.assertIsNot(cell_copy.annotations, cell.annotations)
+        self.assertIs(cell_copy.annotations.target, cell_copy)
+
+    def testAnnotatedCopy(self):
+        cell = dendropy.CharacterDataCell(value="A")
+        cell.annotations.add_new(name="quality", value=30)
+        cell_copy = copy.deepcopy(cell)
+        self.assertEqual(len(cell_copy.annotations), 1)
+        self.assertEqual(cell_copy.annotations[0].value, 30)
+        self.assertIs(cell_copy.annotations.target, cell_copy)
+
+class LazyDefaultOidTest(unittest.TestCase):
+
+    def testLazyDefaultOid(self):
+        t1 = dendropy.Taxon(label="A")
+        self.assertEqual(t1.oid, t1.default_oid)
+        self.assertEqual(t1.oid, t1.oid)
+        t2 = dendropy.Taxon(label="B", oid="t2")
+        self.assertEqual(t2.oid, "t2")
+        t2.oid = None
+        self.assertEqual(t2.oid, t2.default_oid)
+        t3 = copy.deepcopy(dendropy.Node(taxon=t1))
+        self.assertEqual(t3.oid, t3.default_oid)
+
 if __name__ == "__main__":
     unittest.main()
 
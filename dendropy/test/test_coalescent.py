@@ -25,6 +25,7 @@ Tests coalescence calculations.
 """
 
 import unittest
+import random
 from dendropy.utility.messaging import get_logger
 _LOG = get_logger(__name__)
 import dendropy
@@ -41,6 +42,29 @@ class CalcIntervalsTest(unittest.TestCase):
         assert i2 == {7: 1.0, 6:1.0, 5:1.0, 3:1.0, 2:1.0}
         check = coalescent.log_probability_of_coalescent_tree(t, 10)
 
+class CoalesceTest(unittest.TestCase):
+
+    def get_nodes(self, num_nodes=8):
+        return [dendropy.Node(label="g%d" % i) for i in range(num_nodes)]
+
+    def testBoundMatchesCoalesce(self):
+        for period in (None, 0.5, 3.0):
+            nodes1 = coalescent.coalesce(self.get_nodes(),
+                    pop_size=1,
+                    period=period,
+                    rng=random.Random(5))
+            rng = random.Random(5)
+            nodes2 = coalescent._coalesce_bound(self.get_nodes(),
+                    1,
+                    period,
+                    rng.expovariate,
+                    rng.sample)
+            self.assertEqual(len(nodes1), len(nodes2))
+            if period is None:
+                self.assertEqual(len(nodes1), 1)
+            t1 = dendropy.Tree(seed_node=nodes1[0])
+            t2 = dendropy.Tree(seed_node=nodes2[0])
+            self.assertEqual(t1.as_string("newick"), t2.as_string("newick"))
 
 #    if coalescent.de_hoon_statistics:
 #        def testKLDiv(self):
@@ -20,6 +20,7 @@
 Test of data collection classes.
 """
 
+import copy
 import unittest
 from dendropy.utility import containers
 from dendropy.test.support.extendedtest import ExtendedTestCase
@@ -55,6 +56,16 @@ class TestNormalizedBitmaskDict(ExtendedTestCase):
         self.assertNotIn(splits[1][0][0], d)
         self.assertNotIn(splits[1][1][0], d)
 
+        src = dict([(s[0][0], s[0][1]) for s in splits])
+        d = containers.NormalizedBitmaskDict(src, mask=mask)
+        d_copy = copy.deepcopy(d)
+        for o in (d, d_copy):
+            self.assertEqual(len(o), len(splits))
+            for s in splits:
+                self.assertIn(s[0][0], o)
+                self.assertIn(s[1][0], o)
+                self.assertEqual(o[s[1][0]], s[0][1])
+
 class TestOrderedSet(unittest.TestCase):
 
     class DummyObject(object):
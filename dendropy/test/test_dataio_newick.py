@@ -209,6 +209,15 @@ class NewickTreeListWriterTest(datatest.AnnotatedDataObjectVerificationTestCase)
                 distinct_taxa=False,
                 equal_oids=None)
 
+    def testWriteDeepTree(self):
+        ntips = sys.getrecursionlimit() + 100
+        newick_str = ("(" * (ntips-1)) + "t0" + "".join([",t%d:1)" % i for i in xrange(1, ntips)]) + ";"
+        tree1 = dendropy.Tree.get_from_string(newick_str, "newick")
+        self.assertEqual(len(tree1.leaf_nodes()), ntips)
+        tree2 = dendropy.Tree.get_from_string(tree1.as_string("newick"), "newick", taxon_set=tree1.taxon_set)
+        self.assertEqual(len(tree2.leaf_nodes()), ntips)
+        self.assertEqual(tree1.as_string("newick"), tree2.as_string("newick"))
+
 class NewickDocumentReaderTest(datatest.AnnotatedDataObjectVerificationTestCase):
 
     def setUp(self):
@@ -22,9 +22,11 @@ NEXUS data read/write parse/format tests.
 
 import sys
 import os
+import mmap
 import unittest
 from cStringIO import StringIO
 
+from dendropy.test.support import pathmap
 from dendropy.utility import messaging
 from dendropy.dataio import nexustokenizer
 import dendropy
@@ -99,6 +101,39 @@ END;
             token = tokenizer.read_next_token()
             self.assertEqual(e, token)
 
+    def testTokensSpanningReadBuffer(self):
+        f = "Anolis_ahli:0.26 [a [nested] comment] 'quoted ''label''' long-label-x;\nnext_line"
+        expected = ['Anolis ahli', ':', '0.26', 'quoted \'label\'', 'long-label-x', ';', 'next line']
+        for buffer_size in (1, 2, 3, 5, 7, 64):
+            orig_buffer_size = nexustokenizer.STREAM_READ_BUFFER_SIZE
+            nexustokenizer.STREAM_READ_BUFFER_SIZE = buffer_size
+            try:
+                tokenizer = nexustokenizer.NexusTokenizer(StringIO(f))
+                tokens = [tokenizer.read_next_token() for e in expected]
+                self.assertEqual(tokens, expected)
+                self.assertEqual(tokenizer.read_next_token(), None)
+                self.assertTrue(tokenizer.eof)
+            finally:
+                nexustokenizer.STREAM_READ_BUFFER_SIZE = orig_buffer_size
+
+    def testMemoryMappedSource(self):
+        src_path = pathmap.tree_source_path("pythonidae.mle.nex")
+        expected = []
+        tokenizer = nexustokenizer.NexusTokenizer(open(src_path, "rb"))
+        while not tokenizer.eof:
+            expected.append(tokenizer.read_next_token())
+        src = open(src_path, "rb")
+        mapped_src = mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            tokenizer = nexustokenizer.NexusTokenizer(mapped_src)
+            tokens = []
+            while not tokenizer.eof:
+                tokens.append(tokenizer.read_next_token())
+            self.assertEqual(tokens, expected)
+        finally:
+            mapped_src.close()
+            src.close()
+
 class CommentReadingTests(unittest.TestCase):
 
     def testSimplePostNodeComments(self):
@@ -0,0 +1,121 @@
+#! /usr/bin/env python
+
+##############################################################################
+##  DendroPy Phylogenetic Computing Library.
+##
+##  Copyright 2010 Jeet Sukumaran and Mark T. Holder.
+##  All rights reserved.
+##
+##  See "LICENSE.txt" for terms and conditions of usage.
+##
+##  If you use this work or any portion thereof in published work,
+##  please cite it as:
+##
+##     Sukumaran, J. and M. T. Holder. 2010. DendroPy: a Python library
+##     for phylogenetic computing. Bioinformatics 26: 1569-1571.
+##
+##############################################################################
+"""
+Tests binary tree cache.
+"""
+
+import os
+import unittest
+from dendropy.test.support import pathmap
+from dendropy.test.support import datatest
+from dendropy.utility import error
+import dendropy
+
+class TreeCacheTest(datatest.AnnotatedDataObjectVerificationTestCase):
+
+    def setUp(self):
+        self.taxon_set = dendropy.TaxonSet()
+        self.tree_list = dendropy.TreeList.get_from_path(pathmap.tree_source_path("pythonidae.random.bd0301.randomly-rooted.tre"),
+                "nexus",
+                taxon_set=self.taxon_set,
+                as_rooted=True)
+
+    def testRoundTrip(self):
+        output_path = pathmap.named_output_path(filename="roundtrip_test.dpbin", suffix_timestamp=True)
+        self.tree_list.dump_binary(output_path)
+        tree_list2 = dendropy.TreeList.load_binary(output_path, taxon_set=self.taxon_set)
+        self.assertIs(tree_list2.taxon_set, self.taxon_set)
+        self.assertEqual(len(tree_list2), len(self.tree_list))
+        for t1, t2 in zip(self.tree_list, tree_list2):
+            self.assertIs(t2.taxon_set, self.taxon_set)
+            self.assertEqual(t2.label, t1.label)
+            self.assertEqual(t2.is_rooted, t1.is_rooted)
+            self.assertEqual(t2.as_string("newick"), t1.as_string("newick"))
+            self.assertEqual(t1.symmetric_difference(t2), 0)
+
+    def testNewTaxonSet(self):
+        output_path = pathmap.named_output_path(filename="roundtrip_test.dpbin", suffix_timestamp=True)
+        self.tree_list.dump_binary(output_path)
+        tree_list2 = dendropy.TreeList.load_binary(output_path)
+        self.assertIsNot(tree_list2.taxon_set, self.taxon_set)
+        self.assertEqual(tree_list2.taxon_set.labels(), self.taxon_set.labels())
+        self.assertEqual(tree_list2.as_string("newick"), self.tree_list.as_string("newick"))
+
+    def get_unlabelled_taxa_tree_list(self):
+        taxon_set = dendropy.TaxonSet()
+        taxa = [taxon_set.new_taxon(label="A"), taxon_set.new_taxon(), taxon_set.new_taxon()]
+        tree = dendropy.Tree(taxon_set=taxon_set)
+        for taxon in taxa:
+            tree.seed_node.new_child(taxon=taxon, edge_length=1.0)
+        tree_list = dendropy.TreeList(taxon_set=taxon_set)
+        tree_list.append(tree, reindex_taxa=False)
+        return tree_list
+
+    def testUnlabelledTaxaRoundTrip(self):
+        tree_list = self.get_unlabelled_taxa_tree_list()
+        taxon_set = tree_list.taxon_set
+        output_path = pathmap.named_output_path(filename="roundtrip_test.dpbin", suffix_timestamp=True)
+        tree_list.dump_binary(output_path)
+        tree_list2 = dendropy.TreeList.load_binary(output_path)
+        self.assertEqual(len(tree_list2.taxon_set), 3)
+        self.assertEqual([t.label for t in tree_list2.taxon_set], ["A", None, None])
+        leaf_taxa = [nd.taxon for nd in tree_list2[0].leaf_nodes()]
+        self.assertEqual(list(tree_list2.taxon_set), leaf_taxa)
+        taxon_set.lock()
+        tree_list3 = dendropy.TreeList.load_binary(output_path, taxon_set=taxon_set)
+        self.assertEqual(len(taxon_set), 3)
+        for nd1, nd2 in zip(tree_list[0].leaf_nodes(), tree_list3[0].leaf_nodes()):
+            self.assertIs(nd1.taxon, nd2.taxon)
+
+    def testLockedTaxonSet(self):
+        tree_list = self.get_unlabelled_taxa_tree_list()
+        output_path = pathmap.named_output_path(filename="roundtrip_test.dpbin", suffix_timestamp=True)
+        tree_list.dump_binary(output_path)
+        taxon_set = dendropy.TaxonSet(["A"])
+        taxon_set.lock()
+        self.assertRaises(error.DataParseError, dendropy.TreeList.load_binary, output_path, taxon_set=taxon_set)
+        taxon_set.unlock()
+        tree_list2 = dendropy.TreeList.load_binary(output_path, taxon_set=taxon_set)
+        self.assertEqual(len(taxon_set), 3)
+        self.assertIs(tree_list2[0].leaf_nodes()[0].taxon, taxon_set[0])
+
+    def testUserPath(self):
+        output_path = pathmap.named_output_path(filename="roundtrip_test.dpbin", suffix_timestamp=True)
+        home = os.environ.get("HOME")
+        os.environ["HOME"] = os.path.dirname(output_path)
+        try:
+            user_path = os.path.join("~", os.path.basename(output_path))
+            self.tree_list.dump_binary(user_path)
+            tree_list2 = dendropy.TreeList.load_binary(user_path, taxon_set=self.taxon_set)
+        finally:
+            if home is None:
+                del os.environ["HOME"]
+            else:
+                os.environ["HOME"] = home
+        self.assertTrue(os.path.exists(output_path))
+        self.assertEqual(tree_list2.as_string("newick"), self.tree_list.as_string("newick"))
+
+    def testInvalidCache(self):
+        output_path = pathmap.named_output_path(filename="invalid_test.dpbin", suffix_timestamp=True)
+        f = open(output_path, "wb")
+        f.write("#NEXUS\n")
+        f.close()
+        self.assertRaises(error.DataParseError, dendropy.TreeList.load_binary, output_path)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -103,6 +103,77 @@ class TaxaTest(datatest.AnnotatedDataObjectVerificationTestCase):
         self.assertIs(ts.get_taxon(label="Q"), None)
         self.assertIs(ts.get_taxon(label="T1"), ts[0])
 
+    def testFrozenTaxonQuerying(self):
+        ts = dendropy.TaxonSet(self.labels)
+        ts.freeze()
+        self.assertTrue(ts.is_frozen)
+        self.assertIs(ts.get_taxon(label="T1"), ts[0])
+        self.assertIs(ts.get_taxon(label="t2", case_insensitive=True), ts[1])
+        self.assertIs(ts.get_taxon(label="t2"), None)
+        self.assertIs(ts.get_taxon(label="Q"), None)
+        self.assertIs(ts.require_taxon(label="T3"), ts[2])
+        self.assertRaises(KeyError, ts.require_taxon, label="Q")
+        ts.add(dendropy.Taxon(label="X1"))
+        self.assertIs(ts.get_taxon(label="X1"), ts[-1])
+        ts.unfreeze()
+        self.assertFalse(ts.is_frozen)
+        x2 = ts.require_taxon(label="X2")
+        self.assertIs(ts.get_taxon(label="X2"), x2)
+        self.assertEqual(len(ts), 12)
+
+    def testFrozenTaxonSetRelabelling(self):
+        ts = dendropy.TaxonSet(self.labels)
+        ts.freeze()
+        t1 = ts[0]
+        t1.label = "Z"
+        self.assertIs(ts.get_taxon(label="T1"), None)
+        self.assertIs(ts.get_taxon(label="Z"), t1)
+        self.assertIs(ts.get_taxon(label="z", case_insensitive=True), t1)
+        self.assertIs(ts.get_taxon(label="Z"), t1)
+        self.assertIs(ts.require_taxon(label="Z"), t1)
+        self.assertRaises(KeyError, ts.require_taxon, label="T1")
+
+    def testFrozenTaxonSetSwap(self):
+        ts = dendropy.TaxonSet(self.labels)
+        ts.freeze()
+        t1 = ts[0]
+        self.assertIs(ts.get_taxon(label="T1"), t1)
+        ts.remove(t1)
+        t1b = dendropy.Taxon(label="T1")
+        ts.add(t1b)
+        self.assertEqual(len(ts), len(self.labels))
+        self.assertIs(ts.get_taxon(label="T1"), t1b)
+        ts.remove(t1b)
+        x1 = dendropy.Taxon(label="X1")
+        ts.add(x1)
+        self.assertEqual(len(ts), len(self.labels))
+        self.assertIs(ts.get_taxon(label="T1"), None)
+        self.assertIs(ts.get_taxon(label="X1"), x1)
+
+    def testReadIntoFrozenTaxonSet(self):
+        taxa = dendropy.TaxonSet()
+        trees1 = dendropy.TreeList.get_from_path(pathmap.tree_source_path("pythonidae.random.bd0301.randomly-rooted.tre"),
+                "nexus",
+                taxon_set=taxa)
+        num_taxa = len(taxa)
+        taxa.freeze()
+        trees2 = dendropy.TreeList.get_from_path(pathmap.tree_source_path("pythonidae.random.bd0301.midpoint-rooted.tre"),
+                "nexus",
+                taxon_set=taxa)
+        self.assertEqual(len(taxa), num_taxa)
+        self.assertIs(trees2.taxon_set, taxa)
+        for t in trees2[0].leaf_nodes():
+            self.assertIn(t.taxon, taxa)
+
+    def testLabelsInterned(self):
+        tree1 = dendropy.Tree.get_from_string("((A,B),C);", "newick")
+        tree2 = dendropy.Tree.get_from_string("((C,B),A);", "newick")
+        labels1 = dict([(t.label, t.label) for t in tree1.taxon_set])
+        for t in tree2.taxon_set:
+            self.assertIs(t.label, labels1[t.label])
+        u = dendropy.Taxon(label=u"U")
+        self.assertEqual(u.label, u"U")
+
 class TaxonSetPartitionTest(datatest.AnnotatedDataObjectVerificationTestCase):
 
     def setUp(self):
@@ -87,6 +87,21 @@ class TreeListCreateTest(datatest.AnnotatedDataObjectVerificationTestCase):
         tree_list2 = dendropy.TreeList.get_from_path(s, "nexus")
         self.assertDistinctButEqual(tree_list1, tree_list2, distinct_taxa=True)
 
+    def testFromPathsFactory(self):
+        paths = [pathmap.tree_source_path('pythonidae.random.bd0301.randomly-rooted.tre'),
+                pathmap.tree_source_path('pythonidae.random.bd0301.midpoint-rooted.tre')]
+        taxa = dendropy.TaxonSet()
+        tree_list = dendropy.TreeList.get_from_paths(paths, "nexus", taxon_set=taxa)
+        self.assertTrue(tree_list.taxon_set is taxa)
+        num_trees = 0
+        for path in paths:
+            trees = dendropy.TreeList.get_from_path(path, "nexus", taxon_set=taxa)
+            for t1, t2 in zip(tree_list[num_trees:], trees):
+                self.assertTrue(t1.taxon_set is taxa)
+                self.assertEqual(t1.symmetric_difference(t2), 0)
+            num_trees += len(trees)
+        self.assertEqual(len(tree_list), num_trees)
+
     def testFromStringFactoryDistinctTaxa(self):
         tree_list1 = datagen.reference_tree_list()
         tree_list2 = dendropy.TreeList.get_from_string(tree_list1.as_string('nexus'), "nexus")
@@ -57,6 +57,22 @@ class TreeSymmetricDistTest(unittest.TestCase):
          o_tree = dendropy.Tree(stream=StringIO("((t1,t2),((t4,(t5,t6)),t3));"), schema="newick", taxon_set=taxon_set)
          encode_splits(o_tree)
          self.assertEqual(treecalc.symmetric_difference(o_tree, ref), 2)
+         self.assertEqual(treecalc.symmetric_difference(ref, ref), 0)
+
+class TreeFalsePositivesAndNegativesTest(unittest.TestCase):
+
+    def runTest(self):
+         ref = dendropy.Tree(stream=StringIO("[&R] ((t5,t6),((t4,(t2,t1)),t3));"), schema="newick")
+         taxon_set = ref.taxon_set
+         encode_splits(ref)
+         o_tree = dendropy.Tree(stream=StringIO("[&R] ((t5,(t6,t3)),(t4,(t2,t1)));"), schema="newick", taxon_set=taxon_set)
+         encode_splits(o_tree)
+         self.assertEqual(treecalc.false_positives_and_negatives(ref, o_tree), (2, 2))
+         u_tree1 = dendropy.Tree(stream=StringIO("[&U] ((t5,(t6,t3)),(t4,(t2,t1)));"), schema="newick", taxon_set=taxon_set)
+         encode_splits(u_tree1)
+         u_tree2 = dendropy.Tree(stream=StringIO("[&U] (t4,(t1,t2),((t3,t6),t5));"), schema="newick", taxon_set=taxon_set)
+         encode_splits(u_tree2)
+         self.assertEqual(treecalc.false_positives_and_negatives(u_tree1, u_tree2), (0, 0))
 
 class TreePatristicDistTest(unittest.TestCase):
 
@@ -66,6 +66,51 @@ class BirthDeathTreeTest(unittest.TestCase):
 
     
 
+class UniformPureBirthTreeTest(unittest.TestCase):
+
+    def testLeavesAndTaxa(self):
+        """test that the uniform pure-birth process produces ultrametric trees with one leaf per taxon."""
+        _RNG = RepeatedRandom()
+        for num_leaves in range(1, 30):
+            taxon_set = dendropy.new_taxon_set(num_leaves)
+            t = treesim.uniform_pure_birth(taxon_set, rng=_RNG)
+            self.assertTrue(t._debug_tree_is_valid())
+            leaves = t.leaf_nodes()
+            self.assertEquals(num_leaves, len(leaves))
+            self.assertEquals(set(taxon_set), set([nd.taxon for nd in leaves]))
+            depths = [nd.distance_from_root() for nd in leaves]
+            for depth in depths:
+                self.assertAlmostEqual(depth, depths[0], 6)
+
+class PopGenTreeTest(unittest.TestCase):
+
+    def testAnnotations(self):
+        _RNG = RepeatedRandom()
+        taxon_set = dendropy.new_taxon_set(5)
+        pop_sizes = [100] * 11
+        t1 = treesim.pop_gen_tree(taxon_set=taxon_set,
+                num_genes=2,
+                pop_sizes=pop_sizes,
+                rng=_RNG)
+        for edge in t1.postorder_edge_iter():
+            self.assertEqual(edge.pop_size, 100)
+            self.assertEqual(len(edge.annotations), 1)
+        for leaf in t1.leaf_iter():
+            self.assertEqual(leaf.num_genes, 2)
+            self.assertEqual(len(leaf.annotations), 1)
+        t2 = treesim.pop_gen_tree(taxon_set=taxon_set,
+                num_genes=2,
+                pop_sizes=pop_sizes,
+                rng=_RNG,
+                annotate_edges=False,
+                annotate_leaves=False)
+        for edge in t2.postorder_edge_iter():
+            self.assertEqual(edge.pop_size, 100)
+            self.assertEqual(len(edge.annotations), 0)
+        for leaf in t2.leaf_iter():
+            self.assertEqual(leaf.num_genes, 2)
+            self.assertEqual(len(leaf.annotations), 0)
+
 class TruncatedCoalescentTreeTest(unittest.TestCase):
 
     def get_species_tree(self, ntax=10):
@@ -102,6 +147,76 @@ class TruncatedCoalescentTreeTest(unittest.TestCase):
         while len(gene_trees) < 20:
             gene_trees.append(treesim.constrained_kingman(species_tree)[0])
 
+class ConstrainedKingmanTest(unittest.TestCase):
+
+    def setUp(self):
+        self.pop_tree = dendropy.Tree.get_from_string("[&R] ((A:1000,B:1000):500,(C:800,D:800):700);", "newick")
+        for nd in self.pop_tree.postorder_node_iter():
+            nd.edge.pop_size = 100
+            if nd.is_leaf():
+                nd.num_genes = 3
+
+    def testGeneTree(self):
+        _RNG = RepeatedRandom()
+        gene_tree_list = dendropy.TreeList()
+        gene_tree, pop_tree = treesim.constrained_kingman(self.pop_tree,
+                gene_tree_list=gene_tree_list,
+                rng=_RNG)
+        self.assertTrue(gene_tree._debug_tree_is_valid())
+        self.assertTrue(gene_tree_list[0] is gene_tree)
+        leaves = gene_tree.leaf_nodes()
+        self.assertEqual(len(leaves), 12)
+        for leaf in leaves:
+            self.assertTrue(leaf.taxon in gene_tree_list.taxon_set)
+        self.assertEqual(len(gene_tree_list.taxon_set), 12)
+        self.assertTrue(pop_tree is not self.pop_tree)
+        self.assertTrue(pop_tree.taxon_set is self.pop_tree.taxon_set)
+        self.assertEqual(pop_tree.symmetric_difference(self.pop_tree), 0)
+        for nd1, nd2 in zip(pop_tree.postorder_node_iter(), self.pop_tree.postorder_node_iter()):
+            self.assertTrue(nd1 is not nd2)
+            self.assertTrue(nd1.taxon is nd2.taxon)
+            self.assertEqual(nd1.edge.length, nd2.edge.length)
+            self.assertEqual(nd1.edge.pop_size, nd2.edge.pop_size)
+            self.assertTrue(hasattr(nd1, "gene_nodes"))
+            self.assertFalse(hasattr(nd2, "gene_nodes"))
+        for leaf in pop_tree.leaf_iter():
+            self.assertEqual(leaf.num_genes, 3)
+
+    def testDecorateOriginalTree(self):
+        _RNG = RepeatedRandom()
+        gene_tree, pop_tree = treesim.constrained_kingman(self.pop_tree,
+                rng=_RNG,
+                decorate_original_tree=True)
+        self.assertTrue(pop_tree is self.pop_tree)
+        self.assertEqual(len(gene_tree.leaf_nodes()), 12)
+        for nd in pop_tree.postorder_node_iter():
+            self.assertTrue(hasattr(nd, "gene_nodes"))
+
+    def testSingleGenePerPopulation(self):
+        _RNG = RepeatedRandom()
+        for leaf in self.pop_tree.leaf_iter():
+            leaf.num_genes = 1
+        gene_tree, pop_tree = treesim.constrained_kingman(self.pop_tree,
+                rng=_RNG)
+        self.assertTrue(gene_tree._debug_tree_is_valid())
+        leaves = gene_tree.leaf_nodes()
+        self.assertEqual(len(leaves), 4)
+        for leaf in leaves:
+            # lineages that cannot coalesce within an edge still span it
+            self.assertTrue(leaf.edge.length >= 800)
+        depths = [nd.distance_from_root() for nd in leaves]
+        for depth in depths:
+            self.assertAlmostEqual(depth, depths[0], 6)
+
+    def testRootPopSize(self):
+        _RNG = RepeatedRandom()
+        pop_tree = dendropy.Tree.get_from_string("[&R] A:1000;", "newick")
+        pop_tree.seed_node.edge.pop_size = 100
+        pop_tree.seed_node.num_genes = 5
+        gene_tree, pop_tree = treesim.constrained_kingman(pop_tree, rng=_RNG)
+        self.assertTrue(gene_tree._debug_tree_is_valid())
+        self.assertEqual(len(gene_tree.leaf_nodes()), 5)
+
 class PureCoalescentTreeTest(unittest.TestCase):
 
     def runTest(self):
@@ -110,5 +225,78 @@ class PureCoalescentTreeTest(unittest.TestCase):
         t = treesim.pure_kingman(dendropy.new_taxon_set(100), rng=_RNG)
         assert t._debug_tree_is_valid()
 
+class SimulateManyTest(unittest.TestCase):
+
+    def testReplicates(self):
+        taxon_set = dendropy.new_taxon_set(10)
+        trees = treesim.simulate_many(treesim.uniform_pure_birth, 6,
+                num_workers=1,
+                seed=7,
+                taxon_set=taxon_set)
+        self.assertEqual(len(trees), 6)
+        self.assertTrue(trees.taxon_set is taxon_set)
+        self.assertEqual(len(taxon_set), 10)
+        for t in trees:
+            self.assertTrue(t.is_rooted)
+            self.assertEqual(len(t.leaf_nodes()), 10)
+            for leaf in t.leaf_iter():
+                self.assertTrue(leaf.taxon in taxon_set)
+        trees2 = treesim.simulate_many(treesim.uniform_pure_birth, 6,
+                num_workers=1,
+                seed=7,
+                taxon_set=taxon_set)
+        self.assertEqual([t.as_string("newick") for t in trees],
+                [t.as_string("newick") for t in trees2])
+
+    def testWorkersGiveSameTrees(self):
+        if not treesim._MP:
+            _LOG.warn("multiprocessing not available: skipping test of simulation in worker processes")
+            return
+        taxon_set = dendropy.new_taxon_set(10)
+        trees1 = treesim.simulate_many(treesim.uniform_pure_birth, 4,
+                num_workers=1,
+                seed=11,
+                taxon_set=taxon_set)
+        trees2 = treesim.simulate_many(treesim.uniform_pure_birth, 4,
+                num_workers=2,
+                seed=11,
+                taxon_set=taxon_set)
+        self.assertTrue(trees2.taxon_set is taxon_set)
+        self.assertEqual(len(taxon_set), 10)
+        for t1, t2 in zip(trees1, trees2):
+            self.assertEqual(t1.is_rooted, t2.is_rooted)
+            self.assertEqual(t1.as_string("newick"), t2.as_string("newick"))
+            for nd1, nd2 in zip(t1.preorder_node_iter(), t2.preorder_node_iter()):
+                self.assertTrue(nd1.taxon is nd2.taxon)
+                self.assertEqual(nd1.edge.length, nd2.edge.length)
+
+    def testWorkersGiveSameGeneTrees(self):
+        if not treesim._MP:
+            _LOG.warn("multiprocessing not available: skipping test of simulation in worker processes")
+            return
+        pop_tree = dendropy.Tree.get_from_string("[&R] ((A:1000,B:1000):500,(C:800,D:800):700);", "newick")
+        for nd in pop_tree.postorder_node_iter():
+            nd.edge.pop_size = 100
+            if nd.is_leaf():
+                nd.num_genes = 3
+        trees1 = treesim.simulate_many(treesim.constrained_kingman, 4,
+                num_workers=1,
+                seed=3,
+                pop_tree=pop_tree)
+        trees2 = treesim.simulate_many(treesim.constrained_kingman, 4,
+                num_workers=2,
+                seed=3,
+                pop_tree=pop_tree)
+        self.assertEqual(trees1.taxon_set.labels(), trees2.taxon_set.labels())
+        for t1, t2 in zip(trees1, trees2):
+            self.assertTrue(t1.taxon_set is trees1.taxon_set)
+            self.assertTrue(t2.taxon_set is trees2.taxon_set)
+            for nd1, nd2 in zip(t1.preorder_node_iter(), t2.preorder_node_iter()):
+                if nd1.taxon is None:
+                    self.assertTrue(nd2.taxon is None)
+                else:
+                    self.assertEqual(nd1.taxon.label, nd2.taxon.label)
+                self.assertEqual(nd1.edge.length, nd2.edge.length)
+
 if __name__ == "__main__":
     unittest.main()
@@ -21,6 +21,7 @@ Tests native tree structuring routines.
 """
 
 import unittest
+import random
 from dendropy.test.support import pathmap
 from dendropy.utility import messaging
 from dendropy.test.support import extendedtest
@@ -53,6 +54,30 @@ class TestTreeLadderization(unittest.TestCase):
         self.assertEqual(self.clean_newick_str(tree.as_string("newick")),
                self.clean_newick_str("[&R] (((((D,E),C),B),A),((G,H),F));"))
 
+    def testLadderizeAfterRestructuring(self):
+        tree = dendropy.Tree.get_from_string(self.tree_str, "newick")
+        tree.ladderize(ascending=True)
+        tree.ladderize(ascending=True)
+        self.assertEqual(self.clean_newick_str(tree.as_string("newick")),
+                self.clean_newick_str("[&R] ((F,(G,H)),(A,(B,(C,(D,E)))));"))
+        nd_a = tree.find_node_with_taxon_label("A")
+        nd_f = tree.find_node_with_taxon_label("F")
+        nd_f.parent_node.remove_child(nd_f)
+        nd_a.parent_node.add_child(nd_f)
+        tree.ladderize(ascending=True)
+        self.assertEqual(self.clean_newick_str(tree.as_string("newick")),
+                self.clean_newick_str("[&R] (((G,H)),(A,F,(B,(C,(D,E)))));"))
+
+    def testLadderizeAfterReversibleRemoval(self):
+        tree = dendropy.Tree.get_from_string("[&R] ((A,(B,C)),(D,(E,(F,G))));", "newick")
+        tree.ladderize(ascending=True)
+        nd_e = tree.find_node_with_taxon_label("E")
+        nd_e_parent = nd_e.parent_node
+        nd_e_parent.parent_node.reversible_remove_child(nd_e_parent)
+        tree.ladderize(ascending=True)
+        self.assertEqual(self.clean_newick_str(tree.as_string("newick")),
+                self.clean_newick_str("[&R] ((D),(A,(B,C)));"))
+
 class TreeMidpointRootingTest(extendedtest.ExtendedTestCase):
 
     def testMidpointRooting(self):
@@ -61,10 +86,12 @@ class TreeMidpointRootingTest(extendedtest.ExtendedTestCase):
                 "nexus",
                 taxon_set=taxa,
                 as_rooted=True)
+        taxa.freeze()
         expected_trees = dendropy.TreeList.get_from_path(pathmap.tree_source_path('pythonidae.random.bd0301.midpoint-rooted.tre'),
                 "nexus",
                 taxon_set=taxa,
                 as_rooted=True)
+        self.assertEqual(len(test_trees), len(expected_trees))
         for idx, test_tree in enumerate(test_trees):
             expected_tree = expected_trees[idx]
             test_tree.reroot_at_midpoint(update_splits=True)
@@ -74,6 +101,30 @@ class TreeMidpointRootingTest(extendedtest.ExtendedTestCase):
                     continue
                 self.assertAlmostEqual(test_tree.split_edges[split].length, expected_tree.split_edges[split].length, 3)
 
+    def check_midpoint(self, tree):
+        tree.reroot_at_midpoint()
+        self.assertTrue(tree._debug_tree_is_valid())
+        depths = []
+        for child in tree.seed_node.child_nodes():
+            depths.append(max([leaf.distance_from_root() for leaf in child.leaf_nodes()]))
+        depths.sort()
+        self.assertAlmostEqual(depths[-1], depths[-2], 6)
+
+    def testMidpointAtMrca(self):
+        tree = dendropy.Tree.get_from_string("(t0:0.787278800069,(t1:0.197603025367,t2:0.197603025367):0.589675774702):0.327696808239;", "newick")
+        self.check_midpoint(tree)
+        self.assertEqual(len(tree.leaf_nodes()), 3)
+        self.assertEqual(len(tree.seed_node.child_nodes()), 2)
+
+    def testUltrametricTrees(self):
+        from dendropy import treesim
+        rng = random.Random(1)
+        for i in range(100):
+            taxon_set = dendropy.new_taxon_set(rng.randint(2, 30))
+            tree = treesim.uniform_pure_birth(taxon_set, rng=rng)
+            self.check_midpoint(tree)
+            self.assertEqual(len(tree.leaf_nodes()), len(taxon_set))
+
 if __name__ == "__main__":
     unittest.main()
 
@@ -22,6 +22,7 @@ Tree metrics/statistics calculations.
 from itertools import izip
 from math import sqrt
 from dendropy import treesplit
+from dendropy.utility import containers
 from dendropy.utility.messaging import get_logger
 _LOG = get_logger(__name__)
 
@@ -320,6 +321,14 @@ def false_positives_and_negatives(reference_tree, test_tree):
         treesplit.encode_splits(reference_tree)
     if not hasattr(test_tree, "split_edges"):
         treesplit.encode_splits(test_tree)
+    if _same_split_key_space(reference_tree.split_edges, test_tree.split_edges):
+        # keys of both dictionaries are directly comparable, so the splits
+        # of each tree can be treated as a set fingerprint of its topology
+        reference_splits = set(reference_tree.split_edges)
+        test_splits = set(test_tree.split_edges)
+        if reference_splits == test_splits:
+            return 0, 0
+        return len(test_splits - reference_splits), len(reference_splits - test_splits)
     for split in reference_tree.split_edges:
         if split in test_tree.split_edges:
             pass
@@ -337,6 +346,20 @@ def false_positives_and_negatives(reference_tree, test_tree):
     return false_positives, false_negatives
 
 
+def _same_split_key_space(split_edges1, split_edges2):
+    """
+    Returns True if the keys of the two split dictionaries are represented
+    in the same way, i.e., both are plain dictionaries of rooted splits or
+    both are normalized with respect to the same mask, so that a key is
+    found in one of the dictionaries if and only if it is equal to one of
+    its keys.
+    """
+    if type(split_edges1) is not type(split_edges2):
+        return False
+    if isinstance(split_edges1, containers.NormalizedBitmaskDict):
+        return split_edges1.mask == split_edges2.mask
+    return type(split_edges1) is dict
+
 def fitch_down_pass(postorder_node_list, attr_name="state_sets", weight_list=None, taxa_to_state_set_map=None):
     """
     Reads `attr_name` attribute of leaves as an iterable of state sets, and
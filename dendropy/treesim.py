@@ -23,12 +23,20 @@ Tree simulation and generation.
 import sys
 import copy
 import math
+import random
+from cStringIO import StringIO
+try:
+    import multiprocessing
+    _MP = True
+except ImportError:
+    _MP = False
 
 from dendropy.utility import GLOBAL_RNG
 from dendropy.mathlib import probability
 from dendropy import coalescent
 from dendropy import dataobject
 from dendropy import treemanip
+from dendropy.dataio import treecache
 from dendropy.utility.messaging import get_logger
 _LOG = get_logger(__name__)
 
@@ -449,29 +457,132 @@ def discrete_birth_death(birth_rate, death_rate, birth_rate_sd=0.0, death_rate_s
     # return
     return tree
 
+def _depths(tree):
+    """
+    Returns a dictionary with the nodes of `tree` as keys and the sum of
+    edge lengths from the seed node to each node as values, calculated in
+    a single preorder pass.
+    """
+    depths = {}
+    for nd in tree.preorder_node_iter():
+        if nd.parent_node is None:
+            depths[nd] = 0.0
+        elif nd.edge.length is None:
+            depths[nd] = depths[nd.parent_node]
+        else:
+            depths[nd] = depths[nd.parent_node] + nd.edge.length
+    return depths
+
+def _clone_tree_iter(tree, node_attrs=None, edge_attrs=None):
+    """
+    Returns a copy of the topology of `tree` that shares its taxa, with the
+    node labels and edge lengths of the original, as well as the values of
+    any of the attributes named in `node_attrs` and `edge_attrs` that are
+    present on its nodes and edges, respectively. The tree is walked once,
+    with an explicit stack, and nothing else is copied, so this is much
+    cheaper than a deep copy.
+    """
+    if node_attrs is None:
+        node_attrs = []
+    if edge_attrs is None:
+        edge_attrs = []
+    clone_tree = dataobject.Tree(taxon_set=tree.taxon_set)
+    clone_tree.is_rooted = tree.is_rooted
+    to_visit = [(tree.seed_node, None)]
+    while to_visit:
+        nd, clone_parent = to_visit.pop()
+        if clone_parent is None:
+            clone = clone_tree.seed_node
+            clone.taxon = nd.taxon
+            clone.label = nd.label
+            clone.edge.length = nd.edge.length
+        else:
+            clone = clone_parent.add_child(dataobject.Node(taxon=nd.taxon, label=nd.label),
+                    edge_length=nd.edge.length)
+        for attr in node_attrs:
+            if hasattr(nd, attr):
+                setattr(clone, attr, getattr(nd, attr))
+        for attr in edge_attrs:
+            if hasattr(nd.edge, attr):
+                setattr(clone.edge, attr, getattr(nd.edge, attr))
+        children = nd.child_nodes()
+        children.reverse()
+        for child in children:
+            to_visit.append((child, clone))
+    return clone_tree
+
+def _shallow_clone_pop_tree(pop_tree, pop_size_attr='pop_size', num_genes_attr='num_genes'):
+    """
+    Returns a copy of the topology of `pop_tree` that shares its taxa, and
+    which has only the edge lengths, node labels, edge population sizes
+    (`pop_size_attr`) and node numbers of genes (`num_genes_attr`) of the
+    original, as these are all that is needed to simulate gene trees in it.
+    """
+    return _clone_tree_iter(pop_tree,
+            node_attrs=[num_genes_attr],
+            edge_attrs=[pop_size_attr])
+
+def _pure_birth_kernel(num_leaves, birth_rate, rng):
+    """
+    Simulates a uniform-rate pure-birth process until there are
+    `num_leaves` leaves, using plain numbers only. Nodes are identified by
+    the order in which they are born, with the seed node being 0 and the
+    two children of each split being numbered consecutively. Returns a
+    list of the parent of each node (-1 for the seed node), a list of the
+    length of the edge subtending each node, and the list of leaves.
+    """
+    expovariate = rng.expovariate
+    randrange = rng.randrange
+    parents = [-1]
+    edge_lengths = [0.0]
+    # the current leaves are tracked directly: the leaf that splits is
+    # replaced in the list by its first child, and its second child is
+    # appended
+    leaves = [0]
+    # the time since the start of the process at which each current leaf
+    # was born, so that edge lengths can be set once, when a leaf splits
+    # or at the end, instead of being extended at every split
+    leaf_birth_times = [0.0]
+    # the waiting time to the next split depends only on the number of
+    # current leaves, so the waiting times are all drawn up front
+    waiting_times = [expovariate(k/birth_rate) for k in range(1, num_leaves + 1)]
+    elapsed_time = 0.0
+    for waiting_time in waiting_times[:-1]:
+        elapsed_time += waiting_time
+        idx = randrange(len(leaves))
+        parent = leaves[idx]
+        edge_lengths[parent] = elapsed_time - leaf_birth_times[idx]
+        c1 = len(parents)
+        parents.append(parent)
+        parents.append(parent)
+        edge_lengths.append(0.0)
+        edge_lengths.append(0.0)
+        leaves[idx] = c1
+        leaf_birth_times[idx] = elapsed_time
+        leaves.append(c1 + 1)
+        leaf_birth_times.append(elapsed_time)
+    elapsed_time += waiting_times[-1]
+    for idx, leaf in enumerate(leaves):
+        edge_lengths[leaf] = elapsed_time - leaf_birth_times[idx]
+    return parents, edge_lengths, leaves
+
 def uniform_pure_birth(taxon_set, birth_rate=1.0, rng=None):
     "Generates a uniform-rate pure-birth process tree. "
     if rng is None:
         rng = GLOBAL_RNG # use the global rng by default
+    taxa = list(taxon_set)
+    # the process is simulated on plain numbers, and the tree is only
+    # built once it has finished
+    parents, edge_lengths, leaves = _pure_birth_kernel(len(taxa), birth_rate, rng)
     tree = dataobject.Tree(taxon_set=taxon_set)
-    tree.seed_node.edge.length = 0.0
-    leaf_nodes = tree.leaf_nodes()
-    while len(leaf_nodes) < len(taxon_set):
-        waiting_time = rng.expovariate(len(leaf_nodes)/birth_rate)
-        for nd in leaf_nodes:
-            nd.edge.length += waiting_time
-        parent_node = rng.choice(leaf_nodes)
-        c1 = parent_node.new_child()
-        c2 = parent_node.new_child()
-        c1.edge.length = 0.0
-        c2.edge.length = 0.0
-        leaf_nodes = tree.leaf_nodes()
-    leaf_nodes = tree.leaf_nodes()
-    waiting_time = rng.expovariate(len(leaf_nodes)/birth_rate)
-    for nd in leaf_nodes:
-        nd.edge.length += waiting_time
-    for idx, leaf in enumerate(leaf_nodes):
-        leaf.taxon = taxon_set[idx]
+    tree.seed_node.edge.length = edge_lengths[0]
+    nodes = [tree.seed_node]
+    for idx in range(1, len(parents)):
+        nodes.append(nodes[parents[idx]].add_child(dataobject.Node(), edge_length=edge_lengths[idx]))
+    # the leaves are labelled in the order in which the kernel lists them,
+    # which saves walking the finished tree to find them
+    for idx, leaf in enumerate(leaves):
+        nodes[leaf].taxon = taxa[idx]
     tree.is_rooted = True
     return tree
 
@@ -482,7 +593,9 @@ def pop_gen_tree(tree=None,
                  pop_sizes=None,
                  num_genes_attr = 'num_genes',
                  pop_size_attr = 'pop_size',
-                 rng=None):
+                 rng=None,
+                 annotate_edges=True,
+                 annotate_leaves=True):
     """
     This will simulate and return a tree with edges decorated with
     population sizes and leaf nodes decorated by the number of genes
@@ -526,11 +639,18 @@ def pop_gen_tree(tree=None,
     divergence events correspond to the ages in the vector. If a population
     sizes vector is given, it then visits all the edges in postorder, assigning
     population sizes to the attribute with the name specified in
-    'pop_size_attr' (which is persisted as an annotation). During this, if an
+    'pop_size_attr' (which is persisted as an annotation, unless
+    `annotate_edges` is False). During this, if an
     ages vector was *not* given, then the edge lengths are multiplied by the
     population size of the edge so the branch length units will be in
     generations. If an ages vector was given, then it is assumed that the ages
     are already in the proper scale/units.
+
+    If `annotate_edges` is False, then the population sizes are only set as
+    attributes of the edges, and are not persisted as annotations. Likewise,
+    if `annotate_leaves` is False, then the numbers of genes are not persisted
+    as annotations of the leaves. This saves creating an annotation for every
+    edge or leaf when the tree is only going to be used for simulation.
     """
 
     # get our random number generator
@@ -571,29 +691,45 @@ def pop_gen_tree(tree=None,
 
         # get the internal nodes on the tree in reverse branching
         # order, so that newest nodes are returned first
-        nodes = tree.nodes(cmp_fn = lambda x, y : \
-                           int((y.distance_from_root()-x.distance_from_root())*10e+6),
-                           filter_fn = lambda x : not x.is_leaf())
+        depths = _depths(tree)
+        nodes = tree.internal_nodes()
+        nodes.sort(key=depths.get, reverse=True)
+        # distances from the tips, calculated in one postorder pass and
+        # then kept up to date as the ages are assigned, since each node
+        # is visited after its descendents; the children of each internal
+        # node are kept from this pass, to be reused when assigning the ages
+        tip_dist = {}
+        children_by_node = {}
+        for node in tree.postorder_node_iter():
+            children = tuple(node.child_nodes())
+            if not children:
+                tip_dist[node] = 0.0
+            else:
+                children_by_node[node] = children
+                tip_dist[node] = max([tip_dist[child] + (child.edge.length or 0.0) for child in children])
         # assign the ages
         for index, node in enumerate(nodes):
-            for child in node.child_nodes():
-                child.edge.length = ages[index] - child.distance_from_tip()
+            for child in children_by_node[node]:
+                child.edge.length = ages[index] - tip_dist[child]
+            tip_dist[node] = float(ages[index])
 
     # set the gene samples
     if samples is not None:
         for index, leaf in enumerate(tree.leaf_iter()):
             setattr(leaf, num_genes_attr, samples[index])
-            leaf.annotations.add_bound_attribute(num_genes_attr)
+            if annotate_leaves:
+                leaf.annotations.add_bound_attribute(num_genes_attr)
 
-    # set the population sizes
+    # set the population sizes; edge lengths are only rescaled if they
+    # were not set from the ages
     if pop_sizes is not None:
-        index = 0
-        for edge in tree.postorder_edge_iter():
-            setattr(edge, pop_size_attr, pop_sizes[index])
-            edge.annotations.add_bound_attribute(pop_size_attr)
-            if ages is None:
-                edge.length = edge.length * getattr(edge, pop_size_attr)
-            index = index + 1
+        scale_lengths = ages is None
+        for edge, pop_size in zip(tree.postorder_edge_iter(), pop_sizes):
+            setattr(edge, pop_size_attr, pop_size)
+            if annotate_edges:
+                edge.annotations.add_bound_attribute(pop_size_attr)
+            if scale_lengths:
+                edge.length = edge.length * pop_size
 
     return tree
 
@@ -772,6 +908,10 @@ def constrained_kingman(pop_tree,
     haploid population of size N. Otherwise the edge lengths of `pop_tree` is
     taken to be in generations.
 
+    Genes that have not coalesced by the root of `pop_tree` are coalesced
+    without a time constraint in a population of the size given by the root
+    edge of `pop_tree`.
+
     If `gene_tree_list` is given, then the gene tree is added to the
     tree block, and the tree block's taxa block will be used to manage
     the gene tree's `taxa`.
@@ -801,15 +941,36 @@ def constrained_kingman(pop_tree,
     if gene_node_label_func is None:
         gene_node_label_func = lambda x, y: "%s_%02d" % (x, y)
 
+    if decorate_original_tree:
+        working_poptree = pop_tree
+    else:
+        # start with a new copy of the population tree so as to not
+        # to change the original tree
+        working_poptree = _shallow_clone_pop_tree(pop_tree,
+                pop_size_attr=pop_size_attr,
+                num_genes_attr=num_genes_attr)
+
     # we create a set of gene nodes for each leaf node on the population
     # tree, and associate those gene nodes to the leaf by assignment
     # of 'taxon'.
-    for leaf_count, leaf in enumerate(pop_tree.leaf_iter()):
+    # gene taxa are looked up by label in a local index rather than
+    # through `require_taxon()`, which scans the whole taxon set for every
+    # gene
+    gene_taxa = {}
+    for taxon in gtaxa:
+        if taxon.label not in gene_taxa:
+            gene_taxa[taxon.label] = taxon
+    for leaf_count, leaf in enumerate(working_poptree.leaf_iter()):
+        labels = [gene_node_label_func(leaf.taxon.label, gene_count+1) \
+                for gene_count in range(getattr(leaf, num_genes_attr))]
         gene_nodes = []
-        for gene_count in range(getattr(leaf, num_genes_attr)):
-            gene_node = dataobject.Node()
-            gene_node.taxon = gtaxa.require_taxon(label=gene_node_label_func(leaf.taxon.label, gene_count+1))
-            gene_nodes.append(gene_node)
+        for label in labels:
+            try:
+                taxon = gene_taxa[label]
+            except KeyError:
+                taxon = gtaxa.new_taxon(label=label)
+                gene_taxa[label] = taxon
+            gene_nodes.append(dataobject.Node(taxon=taxon))
         leaf.gene_nodes = gene_nodes
 
     # We iterate through the edges of the population tree in post-order,
@@ -820,43 +981,65 @@ def constrained_kingman(pop_tree,
     # this period are added to the genes of the tail (parent) node of
     # the edge.
 
-    if decorate_original_tree:
-        working_poptree = pop_tree
-    else:
-        # start with a new (deep) copy of the population tree so as to not
-        # to change the original tree
-        working_poptree = dataobject.Tree(pop_tree)
+    # the population tree is flattened into parallel lists indexed by the
+    # postorder position of each node: the list of uncoalesced genes
+    # of the node (the same list object as its `gene_nodes` attribute) and,
+    # for every non-root edge, the positions of its head and tail nodes,
+    # its length and its population size (edges without a population size
+    # are taken to be in population units); the root edge's own population
+    # size is kept for the unconstrained coalescent at the mrca
+    node_ids = {}
+    gene_nodes_by_id = []
+    for nd in working_poptree.postorder_node_iter():
+        node_ids[nd] = len(gene_nodes_by_id)
+        if not nd.is_leaf():
+            nd.gene_nodes = []
+        gene_nodes_by_id.append(nd.gene_nodes)
+    schedule = []
+    for edge in working_poptree.postorder_edge_iter():
+        if edge.tail_node is not None:
+            schedule.append((node_ids[edge.head_node],
+                    node_ids[edge.tail_node],
+                    edge.length,
+                    getattr(edge, pop_size_attr, 1)))
+        else:
+            root_pop_size = getattr(edge, pop_size_attr, 1)
 
     # start with a new tree
     gene_tree = dataobject.Tree()
     gene_tree.taxon_set = gtaxa
-    for edge in working_poptree.postorder_edge_iter():
-
-        # if mrca root, run unconstrained coalescent
-        if edge.head_node.parent_node is None:
-            if len(edge.head_node.gene_nodes) > 1:
-                final = coalescent.coalesce(nodes=edge.head_node.gene_nodes,
-                                            pop_size=pop_size,
-                                            period=None,
-                                            rng=rng)
-            else:
-                final = edge.head_node.gene_nodes
-            gene_tree.seed_node = final[0]
-        else:
-
-            if hasattr(edge, pop_size_attr):
-                pop_size = getattr(edge, pop_size_attr)
-            else:
-                # this means all our time will be in population units
-                pop_size = 1
-
-            uncoal = coalescent.coalesce(nodes=edge.head_node.gene_nodes,
-                                         pop_size=pop_size,
-                                         period=edge.length,
-                                         rng=rng)
-            if not hasattr(edge.tail_node, 'gene_nodes'):
-                edge.tail_node.gene_nodes = []
-            edge.tail_node.gene_nodes.extend(uncoal)
+    # the random number generator methods used by the coalescent are bound
+    # once for the whole simulation
+    expo_fn = rng.expovariate
+    sample_fn = rng.sample
+    for head_id, tail_id, length, pop_size in schedule:
+        uncoal = gene_nodes_by_id[head_id]
+        if len(uncoal) > 1:
+            uncoal = coalescent._coalesce_bound(uncoal,
+                                                pop_size,
+                                                length,
+                                                expo_fn,
+                                                sample_fn)
+        elif uncoal and length is not None and length > 0:
+            # a single lineage cannot coalesce, and just extends through
+            # the edge (as `coalesce()` would do)
+            gene_edge = uncoal[0].edge
+            if gene_edge.length is None:
+                gene_edge.length = 0.0
+            gene_edge.length = gene_edge.length + length
+        gene_nodes_by_id[tail_id].extend(uncoal)
+
+    # at the mrca root, run unconstrained coalescent
+    root_gene_nodes = gene_nodes_by_id[node_ids[working_poptree.seed_node]]
+    if len(root_gene_nodes) > 1:
+        final = coalescent._coalesce_bound(root_gene_nodes,
+                                           root_pop_size,
+                                           None,
+                                           expo_fn,
+                                           sample_fn)
+    else:
+        final = root_gene_nodes
+    gene_tree.seed_node = final[0]
 
     gene_tree.is_rooted = True
     if gene_tree_list is not None:
@@ -865,3 +1048,78 @@ def constrained_kingman(pop_tree,
     else:
         return gene_tree, working_poptree
 
+def _simulate_replicate(fn, seed, kwargs):
+    """
+    Returns the tree generated by calling `fn` with `kwargs` and a new
+    random number generator seeded with `seed`. If `fn` returns a sequence
+    of trees (as, e.g., `constrained_kingman()` does), then the first one is
+    returned.
+    """
+    kwargs = dict(kwargs)
+    kwargs["rng"] = random.Random(seed)
+    tree = fn(**kwargs)
+    if not isinstance(tree, dataobject.Tree):
+        tree = tree[0]
+    return tree
+
+def _simulate_replicate_as_cache(args):
+    """
+    Runs `_simulate_replicate()` on the tuple of arguments `args`, and
+    returns the tree in the binary format of `dendropy.dataio.treecache`
+    (which keeps the edge lengths exactly), so that it can be run in a
+    worker process.
+    """
+    fn, seed, kwargs = args
+    tree = _simulate_replicate(fn, seed, kwargs)
+    tree_list = dataobject.TreeList(taxon_set=tree.taxon_set)
+    tree_list.append(tree, reindex_taxa=False)
+    stream = StringIO()
+    treecache.dump_tree_list(tree_list, stream)
+    return stream.getvalue()
+
+def simulate_many(fn, num_reps, num_workers=None, seed=None, **kwargs):
+    """
+    Returns a `TreeList` of `num_reps` independent replicate trees, each
+    generated by calling the tree simulation function `fn` (e.g.,
+    `uniform_pure_birth()`, `pure_kingman()` or `constrained_kingman()`) with
+    the keyword arguments `kwargs`, and spreading the replicates over up to
+    `num_workers` worker processes (by default, one per CPU).
+
+    Each replicate is simulated with its own random number generator,
+    seeded from a generator seeded with `seed`, so that the same trees are
+    returned for the same `seed` regardless of the number of workers.
+
+    If `kwargs` includes a `taxon_set`, then the trees returned will
+    reference the taxa in it; otherwise a new `TaxonSet` is created. Trees
+    simulated in worker processes are passed back in the binary format of
+    `dendropy.dataio.treecache`. Their topologies, taxa, node labels, edge
+    lengths (exactly), rooting states and weights are the same as those of
+    trees simulated in this process, but any other attributes of their nodes
+    and edges, as well as their annotations, are not kept. `fn` and
+    `kwargs` must be picklable for the replicates to be run in worker
+    processes.
+    """
+    seed_rng = random.Random(seed)
+    seeds = [seed_rng.getrandbits(32) for i in range(num_reps)]
+    tree_list = dataobject.TreeList(taxon_set=kwargs.get("taxon_set", None))
+    if num_workers is None:
+        if _MP:
+            num_workers = multiprocessing.cpu_count()
+        else:
+            num_workers = 1
+    if _MP and num_workers > 1 and num_reps > 1:
+        pool = multiprocessing.Pool(min(num_workers, num_reps))
+        try:
+            results = pool.map(_simulate_replicate_as_cache, [(fn, s, kwargs) for s in seeds])
+        finally:
+            pool.close()
+            pool.join()
+        # the trees are reindexed into the taxa of the list as they are
+        # appended, just as the trees simulated in this process are
+        for result in results:
+            for tree in treecache.load_tree_list(StringIO(result)):
+                tree_list.append(tree)
+    else:
+        for s in seeds:
+            tree_list.append(_simulate_replicate(fn, s, kwargs))
+    return tree_list
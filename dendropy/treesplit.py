@@ -295,10 +295,7 @@ def encode_splits(tree, create_dict=True, delete_outdegree_one=True):
     # all the taxa, but only those found on the tree
     if not tree.is_rooted:
         mask = tree.seed_node.edge.split_bitmask
-        d = containers.NormalizedBitmaskDict(mask=mask)
-        for k, v in tree.split_edges.items():
-            d[k] = v
-        tree.split_edges = d
+        tree.split_edges = containers.NormalizedBitmaskDict(tree.split_edges, mask=mask)
 
 def is_compatible(split1, split2, mask):
     """
@@ -185,17 +185,25 @@ class NormalizedBitmaskDict(dict):
             if isinstance(other, NormalizedBitmaskDict):
                 self.mask = other.mask
             if isinstance(other, dict):
-                for key, val in other.items():
-                    self[key] = val
+                self._update_normalized(other.iteritems())
 
     def __deepcopy__(self, memo):
         o = NormalizedBitmaskDict(mask=self.mask)
         memo[id(self)] = o
         o.mask = self.mask
-        for key, val in self.items():
-            o[key] = copy.deepcopy(val, memo)
+        o._update_normalized([(key, copy.deepcopy(val, memo)) for key, val in self.iteritems()])
         return o
 
+    def _update_normalized(self, items):
+        """
+        Adds the (key, value) pairs in `items`, normalizing all the keys
+        first and then storing them in a single `dict.update()`, rather than
+        going through `__setitem__()` for each pair.
+        """
+        normalize = NormalizedBitmaskDict.normalize
+        mask = self.mask
+        dict.update(self, [(normalize(key, mask), val) for key, val in items])
+
     def normalize_key(self, key):
         return NormalizedBitmaskDict.normalize(key, self.mask)
 
@@ -29,6 +29,12 @@ import itertools
 ## NEWICK/NEXUS format support. Placed here instead of `nexustokenizer` so that
 ## it is available to the entire library without needing to import `nexustokenizer`.
 
+## characters that prevent a label from being written as an unquoted NEXUS
+## token with spaces replaced by underscores, and characters that require
+## the label to be quoted, respectively
+_NEXUS_TOKEN_UNDERSCORE_UNSAFE_PATTERN = re.compile('[\(\)\[\]\{\}\\\/\,\;\:\=\*\'\"\`\+\-\<\>\0\t\n]')
+_NEXUS_TOKEN_NEEDS_QUOTING_PATTERN = re.compile('[\(\)\[\]\{\}\\\/\,\;\:\=\*\'\"\`\+\-\<\>\0\t\n\r ]')
+
 def escape_nexus_token(label, preserve_spaces=False, quote_underscores=True):
     """
     Properly protects a NEXUS token.
@@ -37,9 +43,9 @@ def escape_nexus_token(label, preserve_spaces=False, quote_underscores=True):
         return ""
     if not preserve_spaces \
             and "_" not in label \
-            and not re.search('[\(\)\[\]\{\}\\\/\,\;\:\=\*\'\"\`\+\-\<\>\0\t\n]', label):
+            and not _NEXUS_TOKEN_UNDERSCORE_UNSAFE_PATTERN.search(label):
         label = label.replace(' ', '_').replace('\t', '_')
-    elif re.search('[\(\)\[\]\{\}\\\/\,\;\:\=\*\'\"\`\+\-\<\>\0\t\n\r ]', label) \
+    elif _NEXUS_TOKEN_NEEDS_QUOTING_PATTERN.search(label) \
         or quote_underscores and "_" in label:
         s = label.split("'")
         if len(s) == 1: